@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from bug_fixer import BugFixer
+from result_cache import ResultCache
+
+_fixer = None
+
+
+def format_log_line(log: dict) -> str:
+    return f"- Line {log['line_number']}: \"{log['original']}\" → \"{log['fixed']}\" (type: {log['fix_type']})\n"
+
+
+def format_finding(finding: dict) -> str:
+    suggestion = f" → \"{finding['suggestion']}\"" if finding["suggestion"] is not None else ""
+    return (f"- Line {finding['line_number']}:{finding['column'] + 1}-{finding['end_column']} "
+            f"[{finding['severity']}] {finding['fix_type']}: \"{finding['text']}\"{suggestion}\n")
+
+
+def find_sources(source_dir: str) -> list[str]:
+    """Returns relative paths of every .py file under source_dir, skipping earlier fixer outputs."""
+    sources = []
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py") and not name.endswith("_fixed.py"):
+                sources.append(os.path.relpath(os.path.join(root, name), source_dir))
+    return sources
+
+
+def init_worker(use_index: bool = True, use_cache: bool = True):
+    """Builds one BugFixer per worker so the vocabulary is loaded once, not per file."""
+    global _fixer
+    _fixer = BugFixer(use_index=use_index, cache=ResultCache() if use_cache else None)
+
+
+def fix_source(code: str) -> tuple[str, list[dict]]:
+    """Fixes code with the worker's BugFixer."""
+    return _fixer.fix_code(code)
+
+
+def fix_file(task: tuple) -> dict:
+    """Fixes one file with the worker's BugFixer and writes its _fixed.py output."""
+    rel_path, source_path, output_path = task
+    try:
+        with open(source_path, "r") as f:
+            code = f.read()
+
+        fixed_code, logs = _fixer.fix_code(code)
+
+        fixed_path = output_path[:-len(".py")] + "_fixed.py"
+        os.makedirs(os.path.dirname(fixed_path) or ".", exist_ok=True)
+        with open(fixed_path, "w") as f:
+            f.write(fixed_code)
+
+        return {"file": rel_path, "fixed": fixed_path, "logs": list(logs), "error": None}
+    except (OSError, UnicodeDecodeError) as e:
+        return {"file": rel_path, "fixed": None, "logs": [], "error": str(e)}
+
+
+def detect_file(task: tuple) -> dict:
+    """Runs the worker's BugFixer in alert-only mode over one file."""
+    rel_path, source_path, max_findings, min_severity = task
+    try:
+        with open(source_path, "r") as f:
+            code = f.read()
+        return {"file": rel_path, "findings": _fixer.detect(code, max_findings, min_severity), "error": None}
+    except (OSError, UnicodeDecodeError) as e:
+        return {"file": rel_path, "findings": [], "error": str(e)}
+
+
+def detect_tree(source_dir: str, workers: int | None = None, max_findings: int | None = None,
+                min_severity: str = "trivial") -> list[dict]:
+    """Alert-only counterpart of fix_tree: findings for every .py file under source_dir, nothing written."""
+    tasks = [
+        (rel_path, os.path.join(source_dir, rel_path), max_findings, min_severity)
+        for rel_path in find_sources(source_dir)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        init_worker(use_cache=False)
+        return [detect_file(task) for task in tasks]
+
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(True, False)) as pool:
+        return list(pool.map(detect_file, tasks, chunksize=chunksize))
+
+
+def fix_tree(source_dir: str, output_dir: str | None = None, workers: int | None = None,
+             use_index: bool = True, use_cache: bool = True) -> list[dict]:
+    """
+    Fixes every .py file under source_dir across a process pool.
+    Results come back in source order regardless of which worker finished first.
+    """
+    output_dir = output_dir or source_dir
+    tasks = [
+        (rel_path, os.path.join(source_dir, rel_path), os.path.join(output_dir, rel_path))
+        for rel_path in find_sources(source_dir)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        init_worker(use_index, use_cache)
+        return [fix_file(task) for task in tasks]
+
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(use_index, use_cache)) as pool:
+        return list(pool.map(fix_file, tasks, chunksize=chunksize))
+
+
+def write_tree_log(results: list[dict], log_path: str):
+    """Writes the merged fix log, grouped by file in source order, followed by a per-file summary."""
+    total = sum(len(result["logs"]) for result in results)
+    with open(log_path, "w") as f:
+        f.write(f"Fix Log ({total} changes across {len(results)} files):\n")
+        for result in results:
+            if not result["logs"]:
+                continue
+            f.write(f"\n[{result['file']}]\n")
+            for log in result["logs"]:
+                f.write(format_log_line(log))
+
+        f.write("\n--- Summary ---\n")
+        for result in results:
+            if result["error"]:
+                f.write(f"{result['file']}: error ({result['error']})\n")
+                continue
+            counts = {}
+            for log in result["logs"]:
+                counts[log["fix_type"]] = counts.get(log["fix_type"], 0) + 1
+            detail = ", ".join(f"{fix_type}: {count}" for fix_type, count in sorted(counts.items()))
+            f.write(f"{result['file']}: {len(result['logs'])} changes" + (f" ({detail})" if detail else "") + "\n")
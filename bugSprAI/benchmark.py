@@ -0,0 +1,274 @@
+import argparse
+import ast
+import bisect
+import hashlib
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import warnings
+from collections import defaultdict
+from bug_fixer import BugFixer, PIPELINE_VERSION
+from batch import find_sources
+from shared import LACUCARACHA_DIR, load_lacucaracha
+
+# Self-contained laCucaracha modules; the injector itself runs in a child process.
+BugSeverity = load_lacucaracha("config.py", "lacucaracha_config").BugSeverity
+parse_log = load_lacucaracha("bug_log.py", "lacucaracha_bug_log").parse_log
+
+
+def variant_seed(master_seed: int, rel_path: str, variant: int) -> int:
+    """Seed of one buggy variant, independent of which other files or variants are run."""
+    digest = hashlib.sha256(f"{master_seed}:{rel_path.replace(os.sep, '/')}:{variant}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def buggy_line_number(log, line_number: int) -> int:
+    """Where an original line sits in the buggy file; a deleted line maps to the line that took its place."""
+    moved = log.modified_line_number(line_number)
+    if moved is not None:
+        return moved
+    deleted = [n for n, _ in log.deleted_lines]
+    return line_number - bisect.bisect_left(deleted, line_number) + bisect.bisect_left(log.blank_lines_after, line_number)
+
+
+def bug_lines(log, bug: dict) -> set[int]:
+    """Buggy-file lines a bug touched: its own line and every line one of its edits changed."""
+    lines = {buggy_line_number(log, bug["line_number"])}
+    lines.update(buggy_line_number(log, edit[0]) for edit in bug["edits"])
+    return lines
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def parses(code: str) -> bool:
+    try:
+        ast.parse(code)
+    except SyntaxError:
+        return False
+    return True
+
+
+class Tally:
+    """Counts for one bug type, subtype or fix type."""
+
+    def __init__(self):
+        self.total = 0
+        self.matched = 0
+
+    def add(self, matched: bool):
+        self.total += 1
+        self.matched += matched
+
+    def ratio(self) -> float | None:
+        return self.matched / self.total if self.total else None
+
+
+class InjectorProcess:
+    """
+    laCucaracha's injector in a child process, driven through
+    `server.py --stdio` one JSON line at a time. It runs from its own
+    directory, so neither tree's modules shadow the other's.
+    """
+
+    def __init__(self):
+        self.process = subprocess.Popen([sys.executable, "server.py", "--stdio"], cwd=LACUCARACHA_DIR,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8")
+
+    def inject(self, request: dict) -> dict:
+        self.process.stdin.write(json.dumps(request, ensure_ascii=False) + "\n")
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"injector process exited with {self.process.wait()}")
+        response = json.loads(line)
+        if "error" in response:
+            raise ValueError(f"injection failed: {response['error']}")
+        return response
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+
+class Benchmark:
+    """
+    Closed loop between the two halves of the repo: every source gets
+    `variants` buggy copies from seeded BugInjector runs, BugFixer fixes each
+    copy, and every fix record is matched to the injection records by the
+    buggy-file line it touched.
+
+    A bug counts as found when at least one fix lands on a line it changed
+    (recall, per bug type and type/subtype); a fix counts as correct when it
+    lands on any injected bug's line (precision, per fix type). Only the
+    fix_code calls are timed, with the result cache off.
+    """
+
+    def __init__(self, variants: int = 5, bugs_per_lines: int = 3,
+                 severity: BugSeverity = BugSeverity.MODERATE, seed: int = 0):
+        self.variants = variants
+        self.bugs_per_lines = bugs_per_lines
+        self.severity = severity
+        self.seed = seed
+        self.fixer = BugFixer(cache=None)
+        self.injector = None
+
+        self.by_type = defaultdict(Tally)
+        self.by_subtype = defaultdict(Tally)
+        self.by_fix_type = defaultdict(Tally)
+        self.confusion = defaultdict(lambda: defaultdict(int))
+        self.latencies = []
+        self.files = 0
+        self.restored = 0
+        self.fixed_parses = 0
+
+    def inject(self, code: str, rel_path: str, variant: int):
+        response = self.injector.inject({
+            "source": code,
+            "seed": variant_seed(self.seed, rel_path, variant),
+            "bugs_per_lines": self.bugs_per_lines,
+            "severity": self.severity.name,
+            "name": rel_path,
+        })
+        if not response["log"]:
+            # Nothing in the file was eligible for any bug.
+            return response["buggy"], None
+        return response["buggy"], parse_log(response["log"].splitlines(), rel_path)
+
+    def run_variant(self, code: str, rel_path: str, variant: int):
+        buggy_code, log = self.inject(code, rel_path, variant)
+
+        start = time.perf_counter()
+        fixed_code, fixes = self.fixer.fix_code(buggy_code)
+        self.latencies.append(time.perf_counter() - start)
+
+        self.files += 1
+        self.restored += fixed_code.strip() == code.strip()
+        self.fixed_parses += parses(fixed_code)
+
+        bugs = log.bugs if log else []
+        bugs_at = defaultdict(list)
+        for bug in bugs:
+            for line_number in bug_lines(log, bug):
+                bugs_at[line_number].append(bug)
+
+        found = set()
+        for fix in fixes:
+            hits = bugs_at.get(fix["line_number"], [])
+            self.by_fix_type[fix["fix_type"]].add(bool(hits))
+            for bug in hits:
+                found.add(id(bug))
+                self.confusion[bug["bug_type"]][fix["fix_type"]] += 1
+        for bug in bugs:
+            self.by_type[bug["bug_type"]].add(id(bug) in found)
+            self.by_subtype[f"{bug['bug_type']}/{bug.get('bug_subtype', '')}"].add(id(bug) in found)
+
+    def run(self, source_dir: str) -> dict:
+        sources = [rel for rel in find_sources(source_dir) if not rel.endswith("_buggy.py")]
+        skipped = []
+        started = time.perf_counter()
+        self.injector = InjectorProcess()
+        try:
+            for rel_path in sources:
+                try:
+                    with open(os.path.join(source_dir, rel_path), "r") as f:
+                        code = f.read()
+                except (OSError, UnicodeDecodeError) as e:
+                    skipped.append({"file": rel_path, "error": str(e)})
+                    continue
+                for variant in range(self.variants):
+                    self.run_variant(code, rel_path, variant)
+        finally:
+            self.injector.close()
+        return self.report(source_dir, len(sources) - len(skipped), skipped, time.perf_counter() - started)
+
+    def report(self, source_dir: str, sources: int, skipped: list[dict], wall_seconds: float) -> dict:
+        def recall_table(tallies: dict) -> dict:
+            return {name: {"injected": t.total, "found": t.matched, "recall": t.ratio()}
+                    for name, t in sorted(tallies.items())}
+
+        bugs = sum(t.total for t in self.by_type.values())
+        found = sum(t.matched for t in self.by_type.values())
+        fixes = sum(t.total for t in self.by_fix_type.values())
+        correct = sum(t.matched for t in self.by_fix_type.values())
+        latencies = sorted(self.latencies)
+        fix_seconds = sum(latencies)
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "settings": {
+                "source_dir": source_dir,
+                "variants": self.variants,
+                "bugs_per_lines": self.bugs_per_lines,
+                "severity": self.severity.name,
+                "seed": self.seed,
+                "pipeline_version": PIPELINE_VERSION,
+                "vocabulary_version": self.fixer.vocabulary_version,
+                "python": sys.version.split()[0],
+            },
+            "sources": sources,
+            "skipped": skipped,
+            "files": self.files,
+            "bugs": bugs,
+            "fixes": fixes,
+            "precision": correct / fixes if fixes else None,
+            "recall": found / bugs if bugs else None,
+            "restored_files": self.restored,
+            "fixed_files_parse": self.fixed_parses,
+            "by_bug_type": recall_table(self.by_type),
+            "by_bug_subtype": recall_table(self.by_subtype),
+            "by_fix_type": {name: {"fixes": t.total, "correct": t.matched, "precision": t.ratio()}
+                            for name, t in sorted(self.by_fix_type.items())},
+            "confusion": {bug_type: dict(sorted(row.items())) for bug_type, row in sorted(self.confusion.items())},
+            "throughput": {
+                "files_per_sec": self.files / fix_seconds if fix_seconds else None,
+                "latency_ms": {
+                    "p50": percentile(latencies, 50) * 1000,
+                    "p99": percentile(latencies, 99) * 1000,
+                    "max": (latencies[-1] if latencies else 0.0) * 1000,
+                },
+                "wall_seconds": wall_seconds,
+            },
+        }
+
+
+def format_ratio(value: float | None) -> str:
+    return "n/a" if value is None else f"{value:.1%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how well and how fast BugFixer undoes laCucaracha's bugs.")
+    parser.add_argument("source_dir", nargs="?", default=os.path.join("..", "testCode"),
+                        help="directory of clean .py files to inject")
+    parser.add_argument("--variants", type=int, default=5, help="buggy variants per source file")
+    parser.add_argument("--bugs-per-lines", type=int, default=3)
+    parser.add_argument("--severity", choices=[s.name for s in BugSeverity], default="MODERATE")
+    parser.add_argument("--seed", type=int, default=0, help="master seed; every variant's seed is derived from it")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    args = parser.parse_args()
+
+    # Injected escapes and the like make every re-parse warn; the variants are throwaway code.
+    warnings.simplefilter("ignore", SyntaxWarning)
+    benchmark = Benchmark(args.variants, args.bugs_per_lines, BugSeverity[args.severity], args.seed)
+    results = benchmark.run(args.source_dir)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    latency = results["throughput"]["latency_ms"]
+    print(f"📊 {results['files']} variants of {results['sources']} files, {results['bugs']} bugs, {results['fixes']} fixes")
+    print(f"   precision {format_ratio(results['precision'])}, recall {format_ratio(results['recall'])}, "
+          f"{results['restored_files']} restored exactly")
+    for name, row in results["by_bug_type"].items():
+        print(f"   - {name}: {row['found']}/{row['injected']} found ({format_ratio(row['recall'])})")
+    files_per_sec = results["throughput"]["files_per_sec"] or 0.0
+    print(f"   {files_per_sec:.1f} files/sec, p50 {latency['p50']:.1f} ms, p99 {latency['p99']:.1f} ms")
+    print(f"➡️ Results: {args.output}")
+
+if __name__ == "__main__":
+    main()
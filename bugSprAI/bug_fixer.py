@@ -1,87 +1,228 @@
-import re
 import keyword
-import ast
-import pkgutil
 import builtins
+import hashlib
 from fixers import *
+from fixers.word_index import WordIndex
+from fixers.token_stream import TokenStream
+from fixers.base_fixer import FIX_SEVERITY, SEVERITIES, finding
+from shared import Document, load_module_names
+from parse_cache import ParseCache
+from symbols import KnownWords, SymbolTable, unbound_names
+from precheck import Precheck
+
+# Bump whenever a fixer changes its output, so cached results are not reused.
+PIPELINE_VERSION = "6"
+
+# Words that are never treated as typos.
+SAFE_WORDS = ["path", "strftime"]
+
+class FixContext:
+    """
+    Everything one fix_code call works on: the refreshed vocabulary and its
+    word index, the symbol table, the log and the format path taken. It is
+    passed to the shared fixers, so BugFixer and its fixers stay read-only
+    and one instance can serve concurrent calls.
+    """
+
+    def __init__(self, static_words: frozenset):
+        self.logs = []
+        self.known_words = KnownWords(static_words)
+        self.word_index = None
+        self.symbol_table = SymbolTable()
+        # Per-fixer log buffers while a line stage runs.
+        self.buffers = {}
+        self.used_ast = False
+        self.fallback_regions = []
+
+    def log(self, fixer, record: dict):
+        self.buffers.get(fixer, self.logs).append(record)
+
 
 class BugFixer:
-    def __init__(self):
+    def __init__(self, use_index: bool = True, cache=None):
         self.keywords = set(keyword.kwlist)
         self.builtins = set(dir(builtins))
-        self.stdlib_modules = set(name for _, name, _ in pkgutil.iter_modules())
-        self.known_words = set()
-        self.logs = []
+        self.stdlib_modules = set(load_module_names())
+        self.use_index = use_index
+        # Optional ResultCache; unchanged inputs are then served from disk.
+        self.cache = cache
+        self.prepare_vocabulary()
+
+        # Every stage parses through this cache, so an unchanged buffer is parsed once.
+        self.parse_cache = ParseCache()
 
+        # Line fixers, fused per stage into a single pass over the file.
+        # Known words are refreshed between the stages.
         self.pre_fixers = [
-            KeywordFixer(),
-            SymbolFixer(),
-            TypoFixer(),
-            LogicFixer(),
+            [KeywordFixer(), LogicFixer()],
+            [TypoFixer(), SymbolFixer()],
         ]
-
-        self.format_fixer = FormatFixer()
+        self.format_fixer = FormatFixer(parse_cache=self.parse_cache)
         self.indent_fixer = IndentFixer()
 
-    def extract_user_symbols(self, code: str) -> set[str]:
-        """Collects function names, class names, variables, and attributes from code."""
-        user_symbols = set()
+    def prepare_vocabulary(self):
+        """
+        Builds the static vocabulary and its word index once.
+        Call again after changing keywords, builtins or stdlib_modules.
+        Both are only read while fixing, so concurrent calls share them.
+        """
+        self.static_words = frozenset(self.keywords | self.builtins | self.stdlib_modules)
+        self.vocabulary_version = hashlib.sha256("\n".join(sorted(self.static_words)).encode("utf-8")).hexdigest()[:16]
+
+        # Static vocabulary is indexed once; user symbols are overlaid per call.
+        # use_index=False falls back to plain difflib scans.
+        self.word_index = WordIndex(self.static_words, use_index=self.use_index)
+
+    def new_context(self) -> FixContext:
+        return FixContext(self.static_words)
+
+    def extract_user_symbols(self, ctx: FixContext, code: str) -> set[str]:
+        """
+        Collects function names, class names, variables, and attributes from code.
+        Only top-level statements that changed since the last call are walked again.
+        Names the code reads but never binds are left out, so the typo fixers
+        can correct them.
+        """
         try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    user_symbols.add(node.name)
-                elif isinstance(node, ast.ClassDef):
-                    user_symbols.add(node.name)
-                elif isinstance(node, ast.arg):
-                    user_symbols.add(node.arg)
-                elif isinstance(node, ast.Name):
-                    user_symbols.add(node.id)
-                elif isinstance(node, ast.Attribute):
-                    user_symbols.add(node.attr)
+            tree = self.parse_cache.parse(code)
         except SyntaxError:
-            pass
-        return user_symbols
+            return set()
+        return ctx.symbol_table.update(code, tree) - unbound_names(tree)
 
-    def update_known_words(self, code: str):
+    def precheck(self, code: str, original: str) -> Precheck:
+        return Precheck(code, original, self.parse_cache, self.static_words, SAFE_WORDS)
+
+    def update_known_words(self, ctx: FixContext, code: str):
         """Refresh the dictionary of known words for typo fixing."""
-        user_defined = self.extract_user_symbols(code)
-        self.known_words = self.keywords | self.builtins | self.stdlib_modules | user_defined
+        user_defined = self.extract_user_symbols(ctx, code)
+        ctx.known_words = KnownWords(self.static_words, user_defined)
+
+    def run_line_stage(self, ctx: FixContext, fixers: list, doc: Document):
+        """
+        Applies each fixer to a line before moving to the next line, so the
+        stage is one pass over the document. Every fixer logs into its own
+        buffer and the buffers are appended in fixer order, which keeps the
+        log order of running the fixers one after another.
+
+        The document is tokenized once per stage and every fixer gets the
+        same per-line tokens, edited in step as fixers rewrite the line.
+        """
+        ctx.buffers = {fixer: [] for fixer in fixers}
+
+        stream = TokenStream(doc.text())
+        for index in doc.live_indices():
+            line = doc[index]
+            line_number = doc.current_line_number(index)
+            tokens = stream.tokens(line_number)
+            for fixer in fixers:
+                line = fixer.fix_line(ctx, line, line_number, tokens)
+            doc[index] = line
+
+        for buffer in ctx.buffers.values():
+            ctx.logs.extend(buffer)
+        ctx.buffers = {}
 
     def fix_code(self, code: str) -> tuple[str, list[dict]]:
-        self.logs = []
-        self.update_known_words(code)
+        """Returns the fixed code and its fix log. Safe to call from several threads at once."""
+        if self.cache is None:
+            return self.run_pipeline(code)
+        key = self.cache.key(code, PIPELINE_VERSION, self.vocabulary_version)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        fixed_code, logs = self.run_pipeline(code)
+        self.cache.put(key, fixed_code, logs)
+        return fixed_code, logs
 
-        safe_words = ["path", "strftime"]
-        self.known_words.update(safe_words)
+    def run_pipeline(self, code: str) -> tuple[str, list[dict]]:
+        """
+        Runs the fixer stages over code, bypassing the result cache.
 
-        for fixer in [KeywordFixer(), LogicFixer()]:
-            fixer.set_context(self.known_words, self.logs)
-            if hasattr(fixer, "fix_code"):
-                code = fixer.fix_code(code)
-            else:
-                lines = code.splitlines()
-                lines = [fixer.fix_line(line, i + 1) for i, line in enumerate(lines)]
-                code = "\n".join(lines)
+        Before every stage a Precheck of the current text decides which
+        fixers have anything to do, and a stage with none left is skipped
+        without tokenizing. A file that parses and has no unknown names
+        therefore costs one parse and comes back unchanged.
+        """
+        ctx = self.new_context()
+        original = code
+        doc = None
+        check = self.precheck(code, original)
 
-        self.update_known_words(code)
-        self.known_words.update(safe_words)
+        for stage in self.pre_fixers:
+            fixers = [fixer for fixer in stage if check.allows(fixer)]
+            if not fixers:
+                continue
+            self.update_known_words(ctx, code)
+            ctx.known_words.update(SAFE_WORDS)
+            ctx.word_index = self.word_index.overlay(ctx.known_words.dynamic_words())
+            if doc is None:
+                doc = Document(code.splitlines())
+            self.run_line_stage(ctx, fixers, doc)
+            code = doc.text()
+            check = self.precheck(code, original)
 
-        for fixer in [TypoFixer(), SymbolFixer()]:
-            fixer.set_context(self.known_words, self.logs)
-            if hasattr(fixer, "fix_code"):
-                code = fixer.fix_code(code)
-            else:
-                lines = code.splitlines()
-                lines = [fixer.fix_line(line, i + 1) for i, line in enumerate(lines)]
-                code = "\n".join(lines)
+        if check.allows(self.format_fixer):
+            code = self.format_fixer.fix_code(ctx, code)
 
-        self.format_fixer.set_context(self.known_words, self.logs)
-        code = self.format_fixer.fix_code(code)
+            if not ctx.used_ast and check.allows(self.indent_fixer):
+                code = self.indent_fixer.fix_code(ctx, code)
+
+        return code, ctx.logs
+
+    def detect(self, code: str, max_findings: int | None = None, min_severity: str = "trivial") -> list[dict]:
+        """
+        Alert-only pass: runs the same detectors as fix_code in one pass over
+        the original text and returns findings with line/column spans instead
+        of rewriting anything. Findings below min_severity are skipped, and
+        detection stops once max_findings have been collected.
+        """
+        threshold = SEVERITIES[min_severity]
+        findings = []
+
+        def wanted(fix_type: str) -> bool:
+            return SEVERITIES[FIX_SEVERITY[fix_type]] >= threshold
+
+        def add(found: list[dict]) -> bool:
+            """Collects found; True once the limit is reached."""
+            findings.extend(f for f in found if wanted(f["fix_type"]))
+            if max_findings is not None and len(findings) >= max_findings:
+                del findings[max_findings:]
+                return True
+            return False
+
+        ctx = self.new_context()
+        lines = code.splitlines()
+        try:
+            self.parse_cache.parse(code)
+            parsed = True
+        except SyntaxError as e:
+            parsed = False
+            line_number = e.lineno or 1
+            column = max(0, (e.offset or 1) - 1)
+            if add([finding(line_number, column, column + 1, "syntax_error", e.msg, None)]):
+                return findings
 
-        if not self.format_fixer.used_ast:
-            self.indent_fixer.set_context(self.known_words, self.logs)
-            code = self.indent_fixer.fix_code(code)
+        check = self.precheck(code, code)
+        detectors = [fixer for stage in self.pre_fixers for fixer in stage
+                     if wanted(fixer.fix_type) and check.allows(fixer)]
+        # Only a file that does not parse gets IndentFixer's treatment.
+        check_indent = not parsed and wanted("indentation")
+        if not detectors and not check_indent:
+            return findings
 
-        return code, self.logs
+        self.update_known_words(ctx, code)
+        ctx.known_words.update(SAFE_WORDS)
+        ctx.word_index = self.word_index.overlay(ctx.known_words.dynamic_words())
 
+        stream = TokenStream("\n".join(lines))
+        for i, line in enumerate(lines):
+            tokens = stream.tokens(i + 1)
+            for detector in detectors:
+                if add(detector.detect_line(ctx, line, i + 1, tokens)):
+                    return findings
+            if check_indent:
+                indent = len(line) - len(line.lstrip())
+                if indent % 4 and line.strip():
+                    if add([finding(i + 1, 0, indent, "indentation", line[:indent], " " * (-(-indent // 4) * 4))]):
+                        return findings
+        return findings
@@ -1,12 +1,54 @@
+from .token_stream import TokenStream
+
+SEVERITIES = {"trivial": 1, "moderate": 2, "critical": 3}
+
+# How bad the problem behind each fix type is when only alerting.
+FIX_SEVERITY = {
+    "syntax_error": "critical",
+    "keyword_typo": "critical",
+    "symbol_balance": "critical",
+    "logic_bug_fix": "moderate",
+    "typo_correction": "moderate",
+    "indentation": "trivial",
+}
+
+
+def finding(line_number: int, start: int, end: int, fix_type: str, text: str, suggestion: str | None) -> dict:
+    """An alert-only record: what was found where, and what the fixer would write instead."""
+    return {
+        "line_number": line_number,
+        "column": start,
+        "end_column": end,
+        "fix_type": fix_type,
+        "severity": FIX_SEVERITY[fix_type],
+        "text": text,
+        "suggestion": suggestion,
+    }
+
+
 class BaseFixer:
-    def fix_line(self, line: str, line_number: int) -> str:
+    """
+    Fixers keep no per-call state. The known words, word index and log of
+    a call arrive in its FixContext (ctx), so one instance is built per
+    BugFixer and shared by every call, including concurrent ones.
+    """
+
+    # Precheck facts that must all hold for the fixer to run; empty means always.
+    requires = ()
+
+    def fix_line(self, ctx, line: str, line_number: int, tokens=None) -> str:
+        """
+        Fixes one line. tokens are the line's tokens from a shared TokenStream;
+        None means the line is untokenized and the raw text is scanned instead.
+        """
         raise NotImplementedError
 
-    def fix_code(self, code: str) -> str:
+    def detect_line(self, ctx, line: str, line_number: int, tokens=None) -> list[dict]:
+        """Findings fix_line would act on, without building the fixed line."""
+        return []
+
+    def fix_code(self, ctx, code: str) -> str:
         lines = code.splitlines()
-        fixed_lines = [self.fix_line(line, i + 1) for i, line in enumerate(lines)]
+        stream = TokenStream("\n".join(lines))
+        fixed_lines = [self.fix_line(ctx, line, i + 1, stream.tokens(i + 1)) for i, line in enumerate(lines)]
         return "\n".join(fixed_lines)
-
-    def set_context(self, known_words: set, logs: list):
-        self.known_words = known_words
-        self.logs = logs
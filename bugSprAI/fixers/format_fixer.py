@@ -1,20 +1,145 @@
 import ast
+import bisect
+import warnings
 from .base_fixer import BaseFixer
+from .token_stream import TokenStream
+
+BLOCK_STARTERS = {
+    'def', 'class', 'if', 'elif', 'else', 'for', 'while',
+    'try', 'except', 'finally', 'with', 'match', 'case'
+}
+
+# Unindented lines starting with these continue the statement above.
+CONTINUATIONS = ('elif', 'else', 'except', 'finally', ')', ']', '}')
+# Statements that only make sense inside a block, so unindented they are a lost body line.
+BODY_ONLY = {'return', 'pass', 'break', 'continue', 'yield'}
+
+
+def top_level_regions(lines: list[str]) -> list[tuple[int, int]]:
+    """
+    Splits lines into [start, end) regions, one per top-level statement, with
+    any blank, comment or indented lines after it. Decorators stay with their
+    definition, continuation clauses with their header, and an unindented line
+    right after a header (or one that can only be a body line) with the block
+    it was dedented out of. Lines inside a multi-line string start nothing.
+    """
+    string_rows = TokenStream("\n".join(lines)).string_rows
+    starts = [0]
+    previous = ""
+    for i, line in enumerate(lines):
+        if not line.strip() or i in string_rows:
+            continue
+        if i and not line[0].isspace() and not line.startswith(('#',) + CONTINUATIONS) \
+                and not previous.startswith('@') and not previous.endswith(('\\', ':')) \
+                and line.split()[0] not in BODY_ONLY:
+            starts.append(i)
+        if not line.lstrip().startswith('#'):
+            previous = line.rstrip()
+    return [(start, end) for start, end in zip(starts, starts[1:] + [len(lines)])]
+
+
+class Block:
+    """An open block in the fallback formatter: its header keyword and the level of its body."""
+    __slots__ = ("kind", "body_level")
+
+    def __init__(self, kind: str, body_level: int):
+        self.kind = kind
+        self.body_level = body_level
+
 
 class FormatFixer(BaseFixer):
-    def __init__(self):
+    # Code that parses and was not touched is already in shape.
+    requires = ("unformatted",)
+
+    def __init__(self, parse_cache=None, debug: bool = False):
         super().__init__()
-        self.used_ast = False
+        self.parse_cache = parse_cache
+        # Prints how the fallback formatter placed every line.
+        self.debug = debug
+
+    def parse(self, code: str) -> ast.Module:
+        return self.parse_cache.parse(code) if self.parse_cache else ast.parse(code)
 
-    def fix_code(self, code: str) -> str:
+    def fix_code(self, ctx, code: str) -> str:
+        """Formats code; ctx.used_ast and ctx.fallback_regions record which path each part took."""
+        ctx.fallback_regions = []
         try:
-            tree = ast.parse(code)
-            self.used_ast = True
+            tree = self.parse(code)
+            ctx.used_ast = True
             formatted = ast.unparse(tree)
             return self._final_format_pass(formatted)
-        except SyntaxError:
-            self.used_ast = False
-            return self.fallback_format(code)
+        except SyntaxError as e:
+            if self.debug:
+                print(f"✗ AST parsing failed: {e}")
+            return self.recover_regions(ctx, code)
+
+    def recover_regions(self, ctx, code: str) -> str:
+        """
+        Formats a file that does not parse one top-level region at a time.
+
+        The region holding each SyntaxError is blanked out and the rest
+        re-parsed until it parses; those regions keep the ast.unparse path.
+        Only the failing regions go through fallback_format, and each is
+        re-parsed on its own afterwards to see whether the repair took.
+        """
+        lines = code.splitlines()
+        regions = top_level_regions(lines)
+        # Region texts are parsed again here; their warnings were reported by the first parse.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", SyntaxWarning)
+            return self._recover_regions(ctx, lines, regions)
+
+    def _recover_regions(self, ctx, lines: list[str], regions: list[tuple[int, int]]) -> str:
+        starts = [start for start, _ in regions]
+        text = list(lines)
+        broken = set()
+        while True:
+            try:
+                tree = self.parse("\n".join(text))
+                break
+            except SyntaxError as e:
+                if not e.lineno or e.lineno > len(lines):
+                    index = len(regions) - 1
+                else:
+                    index = bisect.bisect_right(starts, e.lineno - 1) - 1
+                if index in broken:
+                    # The error cannot be pinned on a single region.
+                    broken = set(range(len(regions)))
+                    tree = ast.Module(body=[], type_ignores=[])
+                    break
+                broken.add(index)
+                start, end = regions[index]
+                text[start:end] = [''] * (end - start)
+
+        # Statements of the parsed regions, by region.
+        statements = [[] for _ in regions]
+        for node in tree.body:
+            statements[bisect.bisect_right(starts, node.lineno - 1) - 1].append(node)
+
+        ctx.fallback_regions = [regions[index] for index in sorted(broken)]
+        ctx.used_ast = len(broken) < len(regions)
+
+        pieces = []
+        run = []
+        for index, (start, end) in enumerate(regions):
+            if index not in broken:
+                run.extend(statements[index])
+                continue
+            if self.debug:
+                print(f"✗ Falling back on lines {start + 1}-{end}")
+            repaired = self.fallback_format("\n".join(lines[start:end]))
+            try:
+                run.extend(ast.parse(repaired).body)
+                continue
+            except SyntaxError:
+                pass
+            if run:
+                pieces.append(self._final_format_pass(ast.unparse(ast.Module(body=run, type_ignores=[]))))
+                run = []
+            pieces.append(repaired)
+        if run:
+            pieces.append(self._final_format_pass(ast.unparse(ast.Module(body=run, type_ignores=[]))))
+        return "\n".join(pieces)
 
     def _final_format_pass(self, code: str) -> str:
         """Clean up any minor formatting issues from ast.unparse"""
@@ -32,99 +157,71 @@ class FormatFixer(BaseFixer):
         return '\n'.join(fixed_lines)
 
     def fallback_format(self, code: str) -> str:
-        """Fallback formatter with proper scope tracking"""
+        """
+        Fallback formatter with proper scope tracking.
+
+        Keeps an explicit stack of open blocks plus the level of the latest
+        try and if/elif header, so each line is placed in O(1) amortized
+        time instead of scanning back over the lines already placed.
+        """
         lines = code.splitlines()
         if not lines:
             return code
-            
+
+        # Lines inside a multi-line string are its contents, kept as they are.
+        string_rows = TokenStream(code).string_rows
         fixed_lines = []
-        indent_stack = [0]  # Stack of indentation levels
-        
-        block_starters = {
-            'def', 'class', 'if', 'elif', 'else', 'for', 'while', 
-            'try', 'except', 'finally', 'with', 'match', 'case'
-        }
-        
+        blocks = [Block("module", 0)]
+        # Level of the most recent header each continuation clause aligns with.
+        last_header = {"try": 0, "if": 0}
+
         for i, line in enumerate(lines):
             stripped = line.strip()
-            
+
+            if i in string_rows:
+                fixed_lines.append(line)
+                continue
             if not stripped:
                 fixed_lines.append('')
                 continue
-            
-            first_word = stripped.split()[0] if stripped else ''
-            first_word_clean = first_word.rstrip(':')
-            
-            # Calculate what the current indentation should be based on content
-            expected_indent = self._calculate_expected_indent(
-                first_word_clean, fixed_lines, indent_stack
-            )
-            
-            # Update the indent stack based on the expected indentation
-            self._update_indent_stack(expected_indent, indent_stack)
-            
+
+            first_word_clean = stripped.split()[0].rstrip(':')
+
+            # Continuation clauses align with their header, definitions go to the top level,
+            # everything else lands in the innermost open block.
+            if first_word_clean in ('except', 'finally'):
+                expected_indent = last_header["try"]
+            elif first_word_clean in ('elif', 'else'):
+                expected_indent = last_header["if"]
+            elif first_word_clean in ('def', 'class'):
+                expected_indent = 0
+            else:
+                expected_indent = blocks[-1].body_level
+
+            # Close the blocks deeper than this line
+            while len(blocks) > 1 and blocks[-1].body_level > expected_indent:
+                blocks.pop()
+            if blocks[-1].body_level != expected_indent:
+                blocks[-1].body_level = expected_indent
+
             # Add colon if missing for block starters
-            if first_word_clean in block_starters and not stripped.endswith(':'):
+            if first_word_clean in BLOCK_STARTERS and not stripped.endswith(':'):
                 stripped += ':'
-            
-            # Apply indentation
-            current_indent = expected_indent * 4
-            final_line = ' ' * current_indent + stripped
+
+            final_line = ' ' * (expected_indent * 4) + stripped
             fixed_lines.append(final_line)
-            
+            if self.debug:
+                self.trace(i, f"{first_word_clean!r} in {blocks[-1].kind} block at level {expected_indent} -> {final_line!r}")
+
             # If this line starts a new block, prepare for indented content
-            if first_word_clean in block_starters:
-                indent_stack.append(expected_indent + 1)
-        
-        return '\n'.join(fixed_lines)
+            if first_word_clean in BLOCK_STARTERS:
+                blocks.append(Block(first_word_clean, expected_indent + 1))
+            if first_word_clean == 'try':
+                last_header["try"] = expected_indent
+            elif first_word_clean in ('if', 'elif'):
+                last_header["if"] = expected_indent
 
-    def _calculate_expected_indent(self, first_word_clean: str, previous_lines: list, indent_stack: list) -> int:
-        """Calculate the expected indentation level for a line"""
-        
-        # Special cases that align with their matching blocks
-        if first_word_clean in ('except', 'finally'):
-            return self._find_try_block_indent(previous_lines)
-        elif first_word_clean in ('elif', 'else'):
-            return self._find_if_block_indent(previous_lines)
-        elif first_word_clean in ('def', 'class'):
-            return 0  # Top-level
-        elif first_word_clean in {'def', 'class', 'if', 'elif', 'else', 'for', 'while', 
-                                  'try', 'except', 'finally', 'with', 'match', 'case'}:
-            # Other block starters use current level
-            return indent_stack[-1] if indent_stack else 0
-        else:
-            # Regular statements use current level
-            return indent_stack[-1] if indent_stack else 0
-
-    def _update_indent_stack(self, expected_indent: int, indent_stack: list):
-        """Update the indent stack to match the expected indentation level"""
-        # Pop levels that are deeper than our expected level
-        while len(indent_stack) > 1 and indent_stack[-1] > expected_indent:
-            indent_stack.pop()
-        
-        # If we're at a different level than expected, adjust
-        if indent_stack and indent_stack[-1] != expected_indent:
-            indent_stack[-1] = expected_indent
+        return '\n'.join(fixed_lines)
 
-    def _find_try_block_indent(self, previous_lines: list) -> int:
-        """Find the indentation level (in increments of 4) of the matching try statement"""
-        for line in reversed(previous_lines):
-            stripped = line.strip()
-            if stripped:
-                first_word = stripped.split()[0].rstrip(':')  # Remove colon
-                if first_word == 'try':
-                    spaces = len(line) - len(line.lstrip())
-                    level = spaces // 4
-                    return level
-        return 0
-
-    def _find_if_block_indent(self, previous_lines: list) -> int:
-        """Find the indentation level (in increments of 4) of the matching if statement"""
-        for line in reversed(previous_lines):
-            stripped = line.strip()
-            if stripped:
-                first_word = stripped.split()[0].rstrip(':')  # Remove colon
-                if first_word in ('if', 'elif'):
-                    spaces = len(line) - len(line.lstrip())
-                    return spaces // 4
-        return 0
\ No newline at end of file
+    def trace(self, index: int, message: str):
+        print(f"  Line {index + 1}: {message}")
@@ -2,7 +2,9 @@ import ast
 from .base_fixer import BaseFixer
 
 class IndentFixer(BaseFixer):
-    def fix_code(self, code: str) -> str:
+    requires = ("syntax_error",)
+
+    def fix_code(self, ctx, code: str) -> str:
         lines = code.splitlines()
         fixed_lines = []
         
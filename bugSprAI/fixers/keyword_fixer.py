@@ -1,17 +1,54 @@
 import difflib
-from .base_fixer import BaseFixer
+import tokenize
+from .base_fixer import BaseFixer, finding
+from .keyword_typos import KeywordTypoTable
+from .token_stream import replace_span
 
 class KeywordFixer(BaseFixer):
-    def fix_line(self, line: str, line_number: int) -> str:
-        words = line.strip().split()
-        if not words:
+    fix_type = "keyword_typo"
+    # Only words outside the vocabulary are rewritten; in code that parses those are its unbound names.
+    requires = ("unknown_names",)
+    cutoff = 0.7
+    # Built on first use and shared by every KeywordFixer.
+    typo_table = None
+
+    def closest_word(self, ctx, word: str) -> str | None:
+        """
+        Looks word up in the keyword typo table, falling back to the shared
+        word index (or a difflib scan of known_words) on a miss.
+        """
+        if KeywordFixer.typo_table is None:
+            KeywordFixer.typo_table = KeywordTypoTable()
+        close = self.typo_table.lookup(word, self.cutoff)
+        if close:
+            return close
+        if ctx.word_index is not None:
+            return ctx.word_index.get_close_match(word, self.cutoff)
+        close_matches = difflib.get_close_matches(word, ctx.known_words, n=1, cutoff=self.cutoff)
+        return close_matches[0] if close_matches else None
+
+    def leading_word(self, line: str, tokens) -> tuple[str, int] | None:
+        """The first word of the line and its column; with tokens, only a leading name counts."""
+        stripped = line.lstrip()
+        if not stripped:
+            return None
+        column = len(line) - len(stripped)
+        if tokens is None:
+            return stripped.split()[0], column
+        if tokens and tokens[0].type == tokenize.NAME and tokens[0].start == column:
+            return tokens[0].string, column
+        return None
+
+    def fix_line(self, ctx, line: str, line_number: int, tokens=None) -> str:
+        leading = self.leading_word(line, tokens)
+        if leading is None:
             return line
-        first_word = words[0]
-        if first_word not in self.known_words:
-            close = difflib.get_close_matches(first_word, self.known_words, n=1, cutoff=0.7)
+        first_word, column = leading
+        if first_word not in ctx.known_words:
+            close = self.closest_word(ctx, first_word)
             if close:
-                fixed = line.replace(first_word, close[0], 1)
-                self.logs.append({
+                fixed = replace_span(line, tokens, column, column + len(first_word), close)
+                ctx.log(self, {
                     "line_number": line_number,
                     "original": line.strip(),
                     "fixed": fixed.strip(),
@@ -19,3 +56,13 @@ class KeywordFixer(BaseFixer):
                 })
                 return fixed
         return line
+
+    def detect_line(self, ctx, line: str, line_number: int, tokens=None) -> list[dict]:
+        leading = self.leading_word(line, tokens)
+        if leading is None or leading[0] in ctx.known_words:
+            return []
+        first_word, column = leading
+        close = self.closest_word(ctx, first_word)
+        if not close:
+            return []
+        return [finding(line_number, column, column + len(first_word), "keyword_typo", first_word, close)]
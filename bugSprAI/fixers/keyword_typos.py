@@ -0,0 +1,71 @@
+import difflib
+import keyword
+
+# Same neighbors laCucaracha's TypoBug draws replacements from.
+KEYBOARD_NEIGHBORS = {
+    'a': 'qs', 'b': 'vn', 'c': 'xv', 'd': 'sf', 'e': 'wr', 'f': 'dg',
+    'g': 'fh', 'h': 'gj', 'i': 'uo', 'j': 'hk', 'k': 'jl', 'l': 'k',
+    'm': 'n', 'n': 'bm', 'o': 'ip', 'p': 'o', 'q': 'wa', 'r': 'et',
+    's': 'ad', 't': 'ry', 'u': 'iy', 'v': 'cb', 'w': 'qe', 'x': 'zs',
+    'y': 'tu', 'z': 'as'
+}
+
+# Builtins that commonly start a line.
+HOT_BUILTINS = ["print", "super", "setattr", "len", "range", "open", "exit"]
+
+
+def typo_variants(word: str) -> set[str]:
+    """Every single swap, omit, duplicate or neighbor-key replace of word."""
+    variants = set()
+    for i in range(len(word)):
+        if i + 1 < len(word) and word[i] != word[i + 1]:
+            variants.add(word[:i] + word[i + 1] + word[i] + word[i + 2:])
+        variants.add(word[:i] + word[i + 1:])
+        variants.add(word[:i] + word[i] + word[i:])
+        for replacement in KEYBOARD_NEIGHBORS.get(word[i].lower(), ""):
+            variants.add(word[:i] + replacement + word[i + 1:])
+    variants.discard(word)
+    variants.discard("")
+    return variants
+
+
+class KeywordTypoTable:
+    """
+    Precomputed typo variants (up to max_distance edits) of keywords and hot
+    builtins, mapped back to the words they could come from, so a mistyped
+    leading token is corrected with a dict lookup.
+    """
+
+    def __init__(self, words=None, max_distance: int = 2):
+        if words is None:
+            words = keyword.kwlist + HOT_BUILTINS
+        self.table = {}
+        for word in words:
+            frontier = {word}
+            seen = {word}
+            for _ in range(max_distance):
+                frontier = {v for w in frontier for v in typo_variants(w)} - seen
+                seen |= frontier
+                for variant in frontier:
+                    self.table.setdefault(variant, set()).add(word)
+
+    def __len__(self):
+        return len(self.table)
+
+    def lookup(self, token: str, cutoff: float) -> str | None:
+        """
+        The word token is a typo of, or None. Candidates are scored like
+        difflib.get_close_matches, so only corrections that pass cutoff are returned.
+        """
+        sources = self.table.get(token)
+        if not sources:
+            return None
+        best = None
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(token)
+        for candidate in sources:
+            matcher.set_seq1(candidate)
+            score = matcher.ratio()
+            if score >= cutoff and (best is None or (score, candidate) > best):
+                best = (score, candidate)
+        return best[1] if best else None
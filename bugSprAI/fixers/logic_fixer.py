@@ -1,25 +1,57 @@
 import re
-from .base_fixer import BaseFixer
+from .base_fixer import BaseFixer, finding
+from .token_stream import in_code, replace_span
+
+# Rewrites applied in order; each one that matches is logged separately.
+FIXES = [
+    (re.compile(r'!='), '=='),
+    (re.compile(r'>='), '<='),
+    (re.compile(r'<='), '>='),
+    (re.compile(r'\bTrue\b'), 'False'),
+    (re.compile(r'\bFalse\b'), 'True'),
+    (re.compile(r'range\(([^)]+)\s*\+\s*1\)'), r'range(\1)'),
+]
+
+# Matches a line iff at least one of the rewrites does, in a single scan.
+SCANNER = re.compile("|".join(f"(?:{pattern.pattern})" for pattern, _ in FIXES))
+
+# Every rewrite needs one of these characters.
+TRIGGER_CHARS = frozenset("!<>=TF(")
+
 
 class LogicFixer(BaseFixer):
-    def fix_line(self, line: str, line_number: int) -> str:
-        original = line
-        fixes = [
-            (r'!=', '=='),
-            (r'>=', '<='),
-            (r'<=', '>='),
-            (r'\bTrue\b', 'False'),
-            (r'\bFalse\b', 'True'),
-            (r'range\(([^)]+)\s*\+\s*1\)', r'range(\1)')
-        ]
-        for pattern, replacement in fixes:
-            if re.search(pattern, line):
-                fixed_line = re.sub(pattern, replacement, line)
-                self.logs.append({
-                    "line_number": line_number,
-                    "original": line.strip(),
-                    "fixed": fixed_line.strip(),
-                    "fix_type": "logic_bug_fix"
-                })
-                line = fixed_line
+    fix_type = "logic_bug_fix"
+    # Something to rewrite, in code showing other damage: flipping comparisons in clean code only adds bugs.
+    requires = ("logic_candidates", "unknown_names")
+
+    def fix_line(self, ctx, line: str, line_number: int, tokens=None) -> str:
+        if TRIGGER_CHARS.isdisjoint(line) or not SCANNER.search(line):
+            return line
+        for pattern, replacement in FIXES:
+            # Matches starting inside a string or comment are not code and stay as they are.
+            matches = [match for match in pattern.finditer(line) if in_code(tokens, match.start())]
+            if not matches:
+                continue
+            fixed_line = line
+            for match in reversed(matches):
+                fixed_line = replace_span(fixed_line, tokens, match.start(), match.end(), match.expand(replacement))
+            ctx.log(self, {
+                "line_number": line_number,
+                "original": line.strip(),
+                "fixed": fixed_line.strip(),
+                "fix_type": "logic_bug_fix"
+            })
+            line = fixed_line
         return line
+
+    def detect_line(self, ctx, line: str, line_number: int, tokens=None) -> list[dict]:
+        if TRIGGER_CHARS.isdisjoint(line) or not SCANNER.search(line):
+            return []
+        findings = []
+        for pattern, replacement in FIXES:
+            for match in pattern.finditer(line):
+                if in_code(tokens, match.start()):
+                    findings.append(finding(line_number, match.start(), match.end(), "logic_bug_fix",
+                                            match.group(), match.expand(replacement)))
+        findings.sort(key=lambda f: f["column"])
+        return findings
@@ -1,18 +1,35 @@
 import re
-from .base_fixer import BaseFixer
+import tokenize
+from .base_fixer import BaseFixer, finding
+
+PAIRS = {'(': ')', '[': ']', '{': '}'}
+
+
+def unclosed_brackets(line: str, tokens=None) -> list[tuple[str, int]]:
+    """(bracket, column) of every opening bracket left unclosed on the line."""
+    # Brackets inside strings and comments do not count.
+    if tokens is None:
+        chars = enumerate(line)
+    else:
+        chars = ((t.start, t.string) for t in tokens if t.type == tokenize.OP)
+    open_stack = []
+    for i, char in chars:
+        if char in PAIRS:
+            open_stack.append((char, i))
+        elif char in PAIRS.values():
+            if open_stack and PAIRS[open_stack[-1][0]] == char:
+                open_stack.pop()
+    return open_stack
+
 
 class SymbolFixer(BaseFixer):
-    def fix_line(self, line: str, line_number: int) -> str:
-        original = line
-        pairs = {'(': ')', '[': ']', '{': '}'}
-        open_stack = []
+    fix_type = "symbol_balance"
+    requires = ("syntax_error",)
 
-        for i, char in enumerate(line):
-            if char in pairs:
-                open_stack.append((char, i))
-            elif char in pairs.values():
-                if open_stack and pairs[open_stack[-1][0]] == char:
-                    open_stack.pop()
+    def fix_line(self, ctx, line: str, line_number: int, tokens=None) -> str:
+        original = line
+        pairs = PAIRS
+        open_stack = unclosed_brackets(line, tokens)
 
         fixed = line
         for open_char, index in reversed(open_stack):
@@ -26,7 +43,7 @@ class SymbolFixer(BaseFixer):
                 fixed += close_char
 
         if fixed != original:
-            self.logs.append({
+            ctx.log(self, {
                 "line_number": line_number,
                 "original": original.strip(),
                 "fixed": fixed.strip(),
@@ -34,3 +51,9 @@ class SymbolFixer(BaseFixer):
             })
 
         return fixed
+
+    def detect_line(self, ctx, line: str, line_number: int, tokens=None) -> list[dict]:
+        return [
+            finding(line_number, index, index + 1, "symbol_balance", open_char, PAIRS[open_char])
+            for open_char, index in unclosed_brackets(line, tokens)
+        ]
@@ -0,0 +1,120 @@
+import tokenize
+
+# Layout-only tokens carry nothing the line fixers look at.
+SKIPPED = {tokenize.NEWLINE, tokenize.NL, tokenize.INDENT, tokenize.DEDENT, tokenize.ENDMARKER}
+NOT_CODE = {tokenize.STRING, tokenize.COMMENT}
+
+
+class Token:
+    """A token's piece of one line: type, text and columns on that line."""
+    __slots__ = ("type", "string", "start", "end")
+
+    def __init__(self, type: int, string: str, start: int, end: int):
+        self.type = type
+        self.string = string
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Token({tokenize.tok_name[self.type]}, {self.string!r}, {self.start}, {self.end})"
+
+
+class TokenStream:
+    """
+    Tokenizes a file once and groups the tokens by line, so every line fixer
+    can visit just the token kinds it cares about.
+
+    Tokens spanning lines (triple-quoted strings) are split into one piece
+    per line; string_rows holds the 0-based rows such a token continues onto.
+    Broken code is tokenized as far as possible: where tokenize
+    gives up, the offending line is left untokenized (tokens() returns None
+    and fixers fall back to scanning the raw line) and tokenizing resumes
+    after it.
+    """
+
+    def __init__(self, text: str):
+        self.lines = text.split("\n")
+        self.by_line = [[] for _ in self.lines]
+        self.string_rows = set()
+        start = 0
+        while start < len(self.lines):
+            start = self._tokenize_from(start)
+
+    def _tokenize_from(self, start: int) -> int:
+        """Tokenizes lines[start:]; returns where to resume, or len(lines) when done."""
+        readline = iter(line + "\n" for line in self.lines[start:]).__next__
+        try:
+            for token in tokenize.generate_tokens(readline):
+                if token.type not in SKIPPED:
+                    self._add(token, start)
+        except (tokenize.TokenError, SyntaxError) as e:
+            if isinstance(e, tokenize.TokenError):
+                row = e.args[1][0] + start - 1
+            else:
+                row = (e.lineno or 1) + start - 1
+            if row >= len(self.lines) or "EOF in multi-line statement" in str(e.args[0]):
+                # Unclosed brackets are only found at EOF, after every line was tokenized,
+                # though newer Pythons point the error at where the statement starts.
+                return len(self.lines)
+            for index in range(row, len(self.lines)):
+                self.by_line[index] = []
+            self.string_rows = {index for index in self.string_rows if index < row}
+            # An unterminated string is reported where it starts, so resume after that line.
+            if row == start or "string" in str(e.args[0]):
+                self.by_line[row] = None
+                return row + 1
+            return row
+        return len(self.lines)
+
+    def _add(self, token: tokenize.TokenInfo, offset: int):
+        (start_row, start_col), (end_row, end_col) = token.start, token.end
+        if start_row == end_row:
+            self.by_line[start_row + offset - 1].append(Token(token.type, token.string, start_col, end_col))
+            return
+        for row in range(start_row, end_row + 1):
+            index = row + offset - 1
+            line = self.lines[index]
+            first = start_col if row == start_row else 0
+            last = end_col if row == end_row else len(line)
+            self.by_line[index].append(Token(token.type, line[first:last], first, last))
+            if row > start_row:
+                self.string_rows.add(index)
+
+    def tokens(self, line_number: int) -> list[Token] | None:
+        """Tokens on a 1-based line, or None where the line could not be tokenized."""
+        return self.by_line[line_number - 1]
+
+
+def in_code(tokens: list[Token] | None, column: int) -> bool:
+    """Whether column is outside every string and comment on the line."""
+    if tokens is None:
+        return True
+    for token in tokens:
+        if token.start <= column < token.end:
+            return token.type not in NOT_CODE
+    return True
+
+
+def replace_span(line: str, tokens: list[Token] | None, start: int, end: int, text: str) -> str:
+    """
+    Replaces line[start:end] with text and keeps the line's tokens in step:
+    later tokens shift, and tokens covered by the span collapse into one
+    token (of the first one's type) holding text.
+    """
+    if tokens is not None:
+        delta = len(text) - (end - start)
+        kept = []
+        merged = None
+        for token in tokens:
+            if token.end <= start:
+                kept.append(token)
+            elif token.start >= end:
+                token.start += delta
+                token.end += delta
+                kept.append(token)
+            elif merged is None:
+                merged = token
+                merged.start, merged.end, merged.string = start, start + len(text), text
+                kept.append(merged)
+        tokens[:] = kept
+    return line[:start] + text + line[end:]
@@ -1,22 +1,56 @@
 import re
 import difflib
-from .base_fixer import BaseFixer
+import tokenize
+from .base_fixer import BaseFixer, finding
+from .token_stream import replace_span
 
 class TypoFixer(BaseFixer):
-    def fix_line(self, line: str, line_number: int) -> str:
-        def replace_word(match):
-            word = match.group()
-            if word in self.known_words:
+    fix_type = "typo_correction"
+    # Only words outside the vocabulary are rewritten; in code that parses those are its unbound names.
+    requires = ("unknown_names",)
+    cutoff = 0.75
+
+    def closest_word(self, ctx, word: str) -> str | None:
+        """Uses the shared word index when one is set, otherwise scans known_words with difflib."""
+        if ctx.word_index is not None:
+            return ctx.word_index.get_close_match(word, self.cutoff)
+        close_matches = difflib.get_close_matches(word, ctx.known_words, n=1, cutoff=self.cutoff)
+        return close_matches[0] if close_matches else None
+
+    def fix_line(self, ctx, line: str, line_number: int, tokens=None) -> str:
+        def replace_word(word):
+            if word in ctx.known_words:
                 return word
-            close_matches = difflib.get_close_matches(word, self.known_words, n=1, cutoff=0.75)
-            if close_matches:
-                self.logs.append({
+            close = self.closest_word(ctx, word)
+            if close:
+                ctx.log(self, {
                     "line_number": line_number,
                     "original": word,
-                    "fixed": close_matches[0],
+                    "fixed": close,
                     "fix_type": "typo_correction"
                 })
-                return close_matches[0]
+                return close
             return word
 
-        return re.sub(r'\b\w+\b', replace_word, line)
+        if tokens is None:
+            return re.sub(r'\b\w+\b', lambda match: replace_word(match.group()), line)
+        # Only names are looked at, so strings and comments are left alone.
+        for token in [t for t in tokens if t.type == tokenize.NAME]:
+            fixed = replace_word(token.string)
+            if fixed != token.string:
+                line = replace_span(line, tokens, token.start, token.end, fixed)
+        return line
+
+    def detect_line(self, ctx, line: str, line_number: int, tokens=None) -> list[dict]:
+        if tokens is None:
+            words = [(match.group(), match.start()) for match in re.finditer(r'\b\w+\b', line)]
+        else:
+            words = [(t.string, t.start) for t in tokens if t.type == tokenize.NAME]
+        findings = []
+        for word, column in words:
+            if word in ctx.known_words:
+                continue
+            close = self.closest_word(ctx, word)
+            if close:
+                findings.append(finding(line_number, column, column + len(word), "typo_correction", word, close))
+        return findings
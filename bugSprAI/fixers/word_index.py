@@ -0,0 +1,157 @@
+import difflib
+import math
+
+
+def char_masks(word: str) -> dict[str, int]:
+    """Bit mask of the positions each character occupies in word."""
+    masks = {}
+    for i, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def indel_distance(a: str, b: str, b_masks: dict[str, int] | None = None) -> int:
+    """
+    Edit distance using only insertions and deletions (len(a) + len(b) - 2 * LCS).
+    Uses the bit-parallel LCS recurrence, so the cost is O(len(a)) integer operations.
+    """
+    if a == b:
+        return 0
+    if b_masks is None:
+        b_masks = char_masks(b)
+    full = (1 << len(b)) - 1
+    v = full
+    for char in a:
+        u = v & b_masks.get(char, 0)
+        v = ((v + u) | (v - u)) & full
+    lcs = len(b) - bin(v).count("1")
+    return len(a) + len(b) - 2 * lcs
+
+
+def length_bounds(length: int, cutoff: float) -> tuple[int, int]:
+    """
+    Shortest and longest word lengths that can reach cutoff against a word of the given length.
+    ratio = 2 * M / (la + lb) and M <= min(la, lb).
+    """
+    if cutoff <= 0:
+        return 0, math.inf
+    shortest = int(math.ceil(length * cutoff / (2 - cutoff) - 1e-9))
+    longest = int(math.floor(length * (2 - cutoff) / cutoff + 1e-9))
+    return shortest, longest
+
+
+def max_distance_for_cutoff(length: int, other_length: int, cutoff: float) -> int:
+    """
+    Largest indel distance two words of these lengths can be apart while their
+    difflib ratio still reaches cutoff: M <= LCS, so indel <= (1 - cutoff) * (la + lb).
+    """
+    return int(math.floor((1 - cutoff) * (length + other_length) + 1e-9))
+
+
+class BKTree:
+    """Burkhard-Keller tree over indel distance."""
+
+    def __init__(self, words=()):
+        self.root = None
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        if self.root is None:
+            self.root = (word, {})
+            self.size = 1
+            return
+        node_word, children = self.root
+        while True:
+            distance = indel_distance(word, node_word)
+            if distance == 0:
+                return
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (word, {})
+                self.size += 1
+                return
+            node_word, children = child
+
+    def search(self, word: str, radius: int) -> list[str]:
+        """Returns every stored word within radius of word."""
+        if self.root is None:
+            return []
+        found = []
+        masks = char_masks(word)
+        pending = [self.root]
+        while pending:
+            node_word, children = pending.pop()
+            distance = indel_distance(node_word, word, masks)
+            if distance <= radius:
+                found.append(node_word)
+            low, high = distance - radius, distance + radius
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    pending.append(child)
+        return found
+
+    def __len__(self):
+        return self.size
+
+
+class WordIndex:
+    """
+    Candidate index answering the same question as
+    difflib.get_close_matches(word, words, n=1, cutoff=cutoff).
+
+    The BK-tree only narrows the vocabulary to words that could possibly reach
+    the cutoff; the survivors are scored with difflib's own ratio so ranking
+    (including tie-breaks) is identical to a full difflib scan.
+    Set use_index=False to scan with difflib directly.
+    """
+
+    def __init__(self, words=(), use_index: bool = True):
+        self.use_index = use_index
+        self.words = set(words)
+        self.trees = {}
+        self.base = None
+        if use_index:
+            for word in self.words:
+                self.trees.setdefault(len(word), BKTree()).add(word)
+
+    def overlay(self, words) -> "WordIndex":
+        """Returns a view of this index extended with extra words, leaving this index untouched."""
+        view = WordIndex(set(words) - self.all_words(), use_index=self.use_index)
+        view.base = self
+        return view
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.words or (self.base is not None and word in self.base)
+
+    def all_words(self) -> set[str]:
+        if self.base is None:
+            return self.words
+        return self.words | self.base.all_words()
+
+    def candidates(self, word: str, cutoff: float) -> list[str]:
+        """Every indexed word whose ratio against word could reach cutoff."""
+        shortest, longest = length_bounds(len(word), cutoff)
+        found = []
+        for length, tree in self.trees.items():
+            if shortest <= length <= longest:
+                found.extend(tree.search(word, max_distance_for_cutoff(len(word), length, cutoff)))
+        if self.base is not None:
+            found.extend(self.base.candidates(word, cutoff))
+        return found
+
+    def get_close_match(self, word: str, cutoff: float) -> str | None:
+        if not self.use_index:
+            close = difflib.get_close_matches(word, self.all_words(), n=1, cutoff=cutoff)
+            return close[0] if close else None
+
+        best = None
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(word)
+        for candidate in self.candidates(word, cutoff):
+            matcher.set_seq1(candidate)
+            score = matcher.ratio()
+            if score >= cutoff and (best is None or (score, candidate) > best):
+                best = (score, candidate)
+        return best[1] if best else None
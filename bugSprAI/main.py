@@ -1,13 +1,15 @@
+import argparse
 import os
+import sys
 from bug_fixer import BugFixer
+from batch import detect_tree, fix_tree, format_finding, format_log_line, write_tree_log
+from result_cache import ResultCache
 
-def main():
-    target_file = os.path.join("..", "testCode", "example_buggy.py")
-
+def fix_single(target_file: str, use_cache: bool = True):
     with open(target_file, "r") as f:
         code = f.read()
 
-    fixer = BugFixer()
+    fixer = BugFixer(cache=ResultCache() if use_cache else None)
     fixed_code, logs = fixer.fix_code(code)
 
     fixed_path = target_file.replace(".py", "_fixed.py")
@@ -18,14 +20,69 @@ def main():
     with open(log_path, "w") as f:
         f.write(f"Fix Log ({len(logs)} changes):\n\n")
         for log in logs:
-            f.write(
-                f"- Line {log['line_number']}: \"{log['original']}\" → \"{log['fixed']}\" (type: {log['fix_type']})\n"
-            )
+            f.write(format_log_line(log))
 
     print("✅ Bug fix complete.")
     print(f"➡️ Fixed file: {fixed_path}")
     print(f"📝 Log: {log_path}")
 
+def fix_directory(source_dir: str, output_dir: str | None, workers: int | None, use_cache: bool = True):
+    results = fix_tree(source_dir, output_dir=output_dir, workers=workers, use_cache=use_cache)
+    log_path = os.path.join(output_dir or source_dir, "fix_log.txt")
+    write_tree_log(results, log_path)
+
+    failed = [r for r in results if r["error"]]
+    print(f"✅ Bug fix complete: {len(results) - len(failed)} files, {sum(len(r['logs']) for r in results)} changes.")
+    for r in failed:
+        print(f"⚠️ Skipped {r['file']}: {r['error']}")
+    print(f"📝 Log: {log_path}")
+
+def detect(target: str, workers: int | None, max_findings: int | None, min_severity: str) -> int:
+    """Prints findings without writing anything; returns how many were found."""
+    if os.path.isdir(target):
+        results = detect_tree(target, workers=workers, max_findings=max_findings, min_severity=min_severity)
+    else:
+        with open(target, "r") as f:
+            code = f.read()
+        results = [{"file": target, "findings": BugFixer().detect(code, max_findings, min_severity), "error": None}]
+
+    total = 0
+    for result in results:
+        if result["error"]:
+            print(f"⚠️ Skipped {result['file']}: {result['error']}")
+        if result["findings"]:
+            print(f"[{result['file']}]")
+            for found in result["findings"]:
+                sys.stdout.write(format_finding(found))
+            total += len(result["findings"])
+    print(f"🔎 {total} findings in {len(results)} files.")
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Find and fix bugs in Python code.")
+    parser.add_argument("target", nargs="?", default=os.path.join("..", "testCode", "example_buggy.py"),
+                        help="file to fix, or a directory to fix every .py file under it")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for directory mode")
+    parser.add_argument("--output-dir", default=None, help="mirror directory-mode outputs here instead of next to sources")
+    parser.add_argument("--no-cache", action="store_true", help="always run the fixers instead of reusing cached results")
+    parser.add_argument("--clear-cache", action="store_true", help="drop every cached result before running")
+    parser.add_argument("--detect", action="store_true", help="only report findings with their spans; nothing is rewritten")
+    parser.add_argument("--max-findings", type=int, default=None, help="detect mode: stop after this many findings per file")
+    parser.add_argument("--min-severity", choices=["trivial", "moderate", "critical"], default="trivial",
+                        help="detect mode: ignore findings below this severity")
+    args = parser.parse_args()
+
+    if args.detect:
+        # Non-zero exit when anything was found, so CI can gate on it.
+        sys.exit(1 if detect(args.target, args.workers, args.max_findings, args.min_severity) else 0)
+
+    if args.clear_cache:
+        ResultCache().clear()
+
+    if os.path.isdir(args.target):
+        fix_directory(args.target, args.output_dir, args.workers, use_cache=not args.no_cache)
+    else:
+        fix_single(args.target, use_cache=not args.no_cache)
+
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,53 @@
+import ast
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ParseCache:
+    """
+    Content-hash keyed cache of ast.parse results with LRU eviction.
+
+    Failed parses are cached too, and the same SyntaxError is raised again,
+    so broken buffers are not re-parsed either. The cached trees are shared:
+    callers must not mutate them. Lookups are locked, parsing is not, so
+    threads sharing a cache only serialize on the bookkeeping.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(code: str) -> bytes:
+        return hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def parse(self, code: str) -> ast.Module:
+        key = self.key(code)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+        if entry is None:
+            try:
+                entry = (ast.parse(code), None)
+            except SyntaxError as e:
+                entry = (None, e)
+            with self.lock:
+                self.misses += 1
+                self.entries[key] = entry
+                if len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+
+        tree, error = entry
+        if error is not None:
+            raise error.with_traceback(None)
+        return tree
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
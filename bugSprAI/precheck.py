@@ -0,0 +1,59 @@
+from symbols import unbound_names
+from fixers.logic_fixer import SCANNER
+
+
+class Precheck:
+    """
+    Facts about one version of the code, each computed at most once, that
+    decide which fixers have anything to do. A fixer lists the facts it
+    needs in its requires attribute and runs only when all of them hold;
+    a fixer with no requirements always runs.
+
+    - syntax_error: the code does not parse.
+    - unknown_names: some name is read but neither bound in the code nor in
+      the static vocabulary (always assumed when the code does not parse,
+      since its names cannot be resolved).
+    - logic_candidates: some text matches a LogicFixer rewrite.
+    - modified: the code differs from the fixer's input.
+    - unformatted: syntax_error or modified.
+    """
+
+    def __init__(self, code: str, original: str, parse_cache, static_words: frozenset, extra_words=()):
+        self.code = code
+        self.original = original
+        self.parse_cache = parse_cache
+        self.static_words = static_words
+        self.extra_words = set(extra_words)
+        self.facts = {}
+
+    def fact(self, name: str) -> bool:
+        if name not in self.facts:
+            self.facts[name] = getattr(self, f"_{name}")()
+        return self.facts[name]
+
+    def allows(self, fixer) -> bool:
+        return all(self.fact(name) for name in getattr(fixer, "requires", ()))
+
+    def _syntax_error(self) -> bool:
+        try:
+            self.parse_cache.parse(self.code)
+        except SyntaxError:
+            return True
+        return False
+
+    def _unknown_names(self) -> bool:
+        if self.fact("syntax_error"):
+            return True
+        tree = self.parse_cache.parse(self.code)
+        return any(name not in self.static_words and name not in self.extra_words
+                   for name in unbound_names(tree))
+
+    def _logic_candidates(self) -> bool:
+        return SCANNER.search(self.code) is not None
+
+    def _modified(self) -> bool:
+        # Splitting into lines and joining them again is not a change.
+        return self.code != self.original and self.code != "\n".join(self.original.splitlines())
+
+    def _unformatted(self) -> bool:
+        return self.fact("syntax_error") or self.fact("modified")
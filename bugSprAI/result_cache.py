@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from shared import CACHE_DIR
+
+RESULTS_DIR = os.path.join(CACHE_DIR, "results")
+
+
+class ResultCache:
+    """
+    Persistent cache of fix_code results, one JSON file per entry.
+
+    Entries are keyed by the hash of the input code together with the fixer
+    pipeline version and the vocabulary version, so a changed fixer or
+    vocabulary never serves stale output. Hits refresh the entry's mtime and
+    the oldest entries are evicted once the directory grows past max_bytes.
+    Entries are written unlocked; replacing them and the byte count are
+    locked, so threads sharing a cache keep the count in step with the disk.
+    """
+
+    def __init__(self, directory: str = RESULTS_DIR, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(code: str, pipeline_version: str, vocabulary_version: str) -> str:
+        payload = json.dumps([hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest(),
+                              pipeline_version, vocabulary_version])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> tuple[str, list[dict]] | None:
+        path = self.path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["fixed"], entry["logs"]
+
+    def put(self, key: str, fixed_code: str, logs: list[dict]):
+        path = self.path(key)
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # A private temp file per put, so concurrent puts of one key never share a half-written file.
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"fixed": fixed_code, "logs": logs}, f, ensure_ascii=False)
+            size = os.path.getsize(tmp_path)
+        except OSError:
+            self._discard(tmp_path)
+            return
+        with self.lock:
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                self._discard(tmp_path)
+                return
+            if self.total_bytes is None:
+                self.total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self.total_bytes += size - replaced
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    @staticmethod
+    def _discard(tmp_path: str | None):
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _entries(self) -> list[tuple[str, int, int]]:
+        """(path, size, mtime) of every entry on disk."""
+        entries = []
+        try:
+            scan = os.scandir(self.directory)
+        except OSError:
+            return entries
+        with scan:
+            for item in scan:
+                if item.name.endswith(".json"):
+                    try:
+                        stat = item.stat()
+                    except OSError:
+                        continue
+                    entries.append((item.path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def evict(self):
+        """Removes least recently used entries until the cache is back under three quarters of max_bytes."""
+        with self.lock:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 3 // 4
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self.total_bytes = total
+
+    def clear(self):
+        """Invalidates every cached result."""
+        with self.lock:
+            for path, _, _ in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.total_bytes = 0
@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from bug_fixer import BugFixer
+from batch import fix_source, init_worker
+from result_cache import ResultCache
+
+DEFAULT_PORT = 8766
+MAX_BODY = 16 * 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+class FixServer:
+    """
+    Minimal HTTP/1.1 fix service on asyncio streams.
+
+    POST /fix with {"source": "..."} answers {"fixed": "...", "logs": [...]};
+    GET /health answers {"status": "ok"}. The event loop only parses requests:
+    fixing runs in a process pool whose workers each keep one warm BugFixer,
+    or with workers=0 in threads sharing a single BugFixer.
+    """
+
+    def __init__(self, workers: int | None = None, use_cache: bool = True):
+        self.use_cache = use_cache
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        if workers == 0:
+            fixer = BugFixer(cache=ResultCache() if use_cache else None)
+            self.executor = ThreadPoolExecutor()
+            self.fix = fixer.fix_code
+        else:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                initializer=init_worker, initargs=(True, use_cache))
+            self.fix = fix_source
+
+    async def read_head(self, reader: asyncio.StreamReader) -> tuple[str, str, dict] | None:
+        """Request line and headers of the next request; None once the client is done or sent garbage."""
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return None
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            headers["content-length"] = int(headers.get("content-length", 0))
+        except ValueError:
+            return None
+        return method, path, headers
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await self.read_head(reader)
+                if head is None:
+                    break
+                method, path, headers = head
+
+                length = headers["content-length"]
+                if length > MAX_BODY:
+                    await self.reply(writer, 413, {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, response = await self.route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self.reply(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path != "/fix":
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            source = json.loads(body)["source"]
+            if not isinstance(source, str):
+                raise TypeError("source must be a string")
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {"error": f"{type(e).__name__}: {e}"}
+
+        loop = asyncio.get_running_loop()
+        try:
+            fixed, logs = await loop.run_in_executor(self.executor, partial(self.fix, source))
+        except Exception as e:
+            print(f"⚠️ Fix failed: {type(e).__name__}: {e}", file=sys.stderr)
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+        return 200, {"fixed": fixed, "logs": logs}
+
+    async def reply(self, writer: asyncio.StreamWriter, status: int, body: dict, keep_alive: bool = True):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+    async def serve(self, host: str, port: int):
+        # Warm every worker before accepting requests, so no caller pays the vocabulary load.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, partial(self.fix, "")) for _ in range(max(1, self.workers))))
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"🧴 Fix server listening on http://{host}:{server.sockets[0].getsockname()[1]}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve bug fixes from warm worker processes.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind; keep it local")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU); 0 fixes in threads sharing one BugFixer")
+    parser.add_argument("--no-cache", action="store_true", help="always run the fixers instead of reusing cached results")
+    args = parser.parse_args()
+
+    fix_server = FixServer(workers=args.workers, use_cache=not args.no_cache)
+    try:
+        asyncio.run(fix_server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fix_server.close()
+
+if __name__ == "__main__":
+    main()
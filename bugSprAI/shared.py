@@ -0,0 +1,33 @@
+import importlib.util
+import os
+import sys
+
+BUGSPRAI_DIR = os.path.dirname(os.path.abspath(__file__))
+# Modules both tools use live once, in laCucaracha/utils.
+LACUCARACHA_DIR = os.path.join(BUGSPRAI_DIR, "..", "laCucaracha")
+
+
+def load_lacucaracha(relative_path: str, name: str):
+    """
+    Imports one self-contained laCucaracha module by file path under a
+    private name. sys.path is left alone, so same-named modules of the two
+    trees never shadow each other.
+    """
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(LACUCARACHA_DIR, relative_path))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+_document = load_lacucaracha(os.path.join("utils", "document.py"), "lacucaracha_document")
+_module_index = load_lacucaracha(os.path.join("utils", "module_index.py"), "lacucaracha_module_index")
+
+Document = _document.Document
+CACHE_DIR = _module_index.CACHE_DIR
+
+
+def load_module_names(refresh: bool = False) -> set[str]:
+    """Importable module names, leaving out bugSprAI's own modules."""
+    return _module_index.load_module_names(exclude=(BUGSPRAI_DIR,), refresh=refresh)
@@ -0,0 +1,109 @@
+import ast
+
+
+def node_symbols(node: ast.AST) -> set[str]:
+    """Collects function names, class names, variables, and attributes under node."""
+    symbols = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.FunctionDef):
+            symbols.add(child.name)
+        elif isinstance(child, ast.ClassDef):
+            symbols.add(child.name)
+        elif isinstance(child, ast.arg):
+            symbols.add(child.arg)
+        elif isinstance(child, ast.Name):
+            symbols.add(child.id)
+        elif isinstance(child, ast.Attribute):
+            symbols.add(child.attr)
+    return symbols
+
+
+def unbound_names(node: ast.AST) -> set[str]:
+    """
+    Names read under node that nothing under node binds. A star import
+    could bind any of them, so then there are none; dunders such as
+    __file__ are bound by the import system.
+    """
+    bound, loaded = set(), set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            (loaded if isinstance(child.ctx, ast.Load) else bound).add(child.id)
+        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(child.name)
+        elif isinstance(child, ast.arg):
+            bound.add(child.arg)
+        elif isinstance(child, ast.alias):
+            if child.name == "*":
+                return set()
+            bound.add(child.asname or child.name.split(".")[0])
+        elif isinstance(child, ast.ExceptHandler) and child.name:
+            bound.add(child.name)
+        elif isinstance(child, (ast.Global, ast.Nonlocal)):
+            bound.update(child.names)
+        elif isinstance(child, (ast.MatchAs, ast.MatchStar)) and child.name:
+            bound.add(child.name)
+        elif isinstance(child, ast.MatchMapping) and child.rest:
+            bound.add(child.rest)
+    return {name for name in loaded - bound if not (name.startswith("__") and name.endswith("__"))}
+
+
+class SymbolTable:
+    """
+    User symbols tracked per top-level statement.
+
+    Each statement is keyed by its source lines and column span; statements
+    whose text did not change since the last update reuse their symbols and
+    only the changed ones are walked.
+    """
+
+    def __init__(self):
+        self.by_statement = {}
+
+    def update(self, code: str, tree: ast.Module) -> set[str]:
+        lines = code.splitlines()
+        previous = self.by_statement
+        self.by_statement = {}
+        symbols = set()
+        for node in tree.body:
+            key = (
+                "\n".join(lines[node.lineno - 1:node.end_lineno]),
+                node.col_offset,
+                node.end_col_offset,
+            )
+            found = previous.get(key)
+            if found is None:
+                found = node_symbols(node)
+            self.by_statement[key] = found
+            symbols |= found
+        return symbols
+
+
+class KnownWords:
+    """
+    Layered vocabulary: the static words (keywords, builtins, modules) are
+    held once and shared, user symbols and extra words sit on top, and
+    lookups check each layer instead of building a union set.
+    """
+
+    def __init__(self, static: frozenset, user: set | None = None):
+        self.static = static
+        self.user = user or set()
+        self.extra = set()
+
+    def __contains__(self, word) -> bool:
+        return word in self.user or word in self.static or word in self.extra
+
+    def __iter__(self):
+        yield from self.static
+        for word in self.dynamic_words():
+            yield word
+
+    def __len__(self) -> int:
+        return len(self.static) + len(self.dynamic_words())
+
+    def update(self, words):
+        self.extra.update(words)
+
+    def dynamic_words(self) -> set[str]:
+        """Words present in the non-static layers only."""
+        return (self.user | self.extra) - self.static
@@ -0,0 +1,23 @@
+from fixers.format_fixer import top_level_regions
+from bug_fixer import BugFixer
+
+CODE = '''def f(:
+    x = 1
+    s = """
+line one
+line two
+"""
+    return s
+
+y = 2'''
+
+
+def test_string_lines_do_not_start_regions():
+    assert top_level_regions(CODE.splitlines()) == [(0, 8), (8, 9)]
+
+
+def test_function_with_multiline_string_stays_whole():
+    fixed, _ = BugFixer(cache=None).fix_code(CODE)
+    lines = fixed.splitlines()
+    assert lines[3:6] == ["line one", "line two", '"""']
+    assert lines[6] == "    return s"
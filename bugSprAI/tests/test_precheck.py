@@ -0,0 +1,37 @@
+import pytest
+from bug_fixer import BugFixer
+
+CLEAN = """import os
+
+
+def list_python_files(directory):
+    names = []
+    for name in os.listdir(directory):
+        if name.endswith(".py") and not name.startswith("_"):
+            names.append(name)
+    return sorted(names)
+"""
+
+
+@pytest.fixture(scope="module")
+def fixer():
+    return BugFixer(cache=None)
+
+
+def all_fixers(fixer):
+    return [f for stage in fixer.pre_fixers for f in stage] + [fixer.format_fixer, fixer.indent_fixer]
+
+
+def test_clean_file_is_skipped(fixer):
+    check = fixer.precheck(CLEAN, CLEAN)
+    assert not any(check.allows(f) for f in all_fixers(fixer))
+    assert fixer.fix_code(CLEAN) == (CLEAN, [])
+
+
+def test_real_typo_is_not_skipped(fixer):
+    code = CLEAN.replace("sorted(names)", "sortd(names)")
+    check = fixer.precheck(code, code)
+    assert check.fact("unknown_names")
+    fixed, fixes = fixer.fix_code(code)
+    assert "return sorted(names)" in fixed
+    assert [(fix["original"], fix["fixed"]) for fix in fixes] == [("sortd", "sorted")]
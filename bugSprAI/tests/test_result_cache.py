@@ -0,0 +1,32 @@
+import os
+import threading
+from result_cache import ResultCache
+
+
+def disk_bytes(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def test_overwriting_a_key_replaces_its_size(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("a", "x = 1", [])
+    cache.put("b", "y = 2", [])
+    cache.put("a", "x = 1\n" * 100, [{"line_number": 1}])
+    assert cache.total_bytes == disk_bytes(tmp_path)
+    assert cache.get("a") == ("x = 1\n" * 100, [{"line_number": 1}])
+
+
+def test_concurrent_puts_keep_the_count(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("first", "", [])
+
+    def worker(n: int):
+        for i in range(50):
+            cache.put(f"key{i % 10}", "x = 1\n" * (n + i), [])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.total_bytes == disk_bytes(tmp_path)
@@ -0,0 +1,19 @@
+from bug_fixer import BugFixer
+from fixers.token_stream import TokenStream
+
+# Unclosed brackets mid-file and on the last line; the error points at the last line.
+CODE = """values = [1, 2
+if values
+    print(1"""
+
+
+def test_unclosed_bracket_keeps_every_line_tokenized():
+    stream = TokenStream(CODE)
+    assert [token.string for token in stream.tokens(1)] == ["values", "=", "[", "1", ",", "2"]
+    assert [token.string for token in stream.tokens(3)] == ["print", "(", "1"]
+
+
+def test_unclosed_bracket_line_is_not_rewritten():
+    fixed, fixes = BugFixer(cache=None).fix_code(CODE)
+    assert not [fix for fix in fixes if fix["fix_type"] == "keyword_typo"]
+    assert fixed.endswith("print(1)")
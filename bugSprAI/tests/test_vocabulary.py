@@ -0,0 +1,15 @@
+import os
+from bug_fixer import BugFixer
+from shared import BUGSPRAI_DIR
+
+
+def test_own_modules_are_not_vocabulary():
+    fixer = BugFixer(cache=None)
+    own = {name[:-3] for name in os.listdir(BUGSPRAI_DIR) if name.endswith(".py")}
+    assert not own & fixer.static_words - fixer.builtins - fixer.keywords
+    assert "os" in fixer.static_words
+
+
+def test_word_near_own_module_is_left_alone():
+    code = "def f(x):\n    return never\n"
+    assert BugFixer(cache=None).fix_code(code) == (code.rstrip("\n"), [])
@@ -0,0 +1,49 @@
+import builtins
+import difflib
+import keyword
+import random
+import pytest
+from fixers.word_index import WordIndex
+
+WORDS = sorted(set(keyword.kwlist) | set(dir(builtins)) | {"os", "sys", "json", "pathlib", "collections"})
+
+
+def typos(words, count, seed=0):
+    """Words with one character dropped, doubled, swapped or replaced, plus a few random strings."""
+    rng = random.Random(seed)
+    found = []
+    for _ in range(count):
+        word = rng.choice(words)
+        i = rng.randrange(len(word))
+        edit = rng.randrange(4)
+        if edit == 0:
+            word = word[:i] + word[i + 1:]
+        elif edit == 1:
+            word = word[:i] + word[i] + word[i:]
+        elif edit == 2 and i + 1 < len(word):
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        else:
+            word = word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz_") + word[i + 1:]
+        found.append(word)
+    found.extend("".join(rng.choice("abcdefghij") for _ in range(rng.randint(1, 12))) for _ in range(count // 4))
+    return found
+
+
+def difflib_match(word, words, cutoff):
+    close = difflib.get_close_matches(word, words, n=1, cutoff=cutoff)
+    return close[0] if close else None
+
+
+@pytest.mark.parametrize("cutoff", [0.6, 0.75, 0.9])
+def test_matches_difflib(cutoff):
+    index = WordIndex(WORDS)
+    for word in typos(WORDS, 300):
+        assert index.get_close_match(word, cutoff) == difflib_match(word, WORDS, cutoff), word
+
+
+def test_overlay_matches_difflib_over_both_layers():
+    user = ["total_count", "parse_line", "reader", "items_seen"]
+    view = WordIndex(WORDS).overlay(user)
+    for word in typos(user, 100, seed=1) + typos(WORDS, 100, seed=2):
+        assert view.get_close_match(word, 0.75) == difflib_match(word, WORDS + user, 0.75), word
+    assert "reader" in view and "print" in view
@@ -0,0 +1,72 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from config import BugInjectionConfig
+from injector import BugInjector
+
+GENERATED_SUFFIXES = ("_buggy.py", "_fixed.py")
+
+
+def file_seed(master_seed: int | None, rel_path: str) -> int | None:
+    """Derives a per-file seed from the master seed and the file's path relative to the tree root."""
+    if master_seed is None:
+        return None
+    digest = hashlib.sha256(f"{master_seed}:{rel_path.replace(os.sep, '/')}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def find_sources(source_dir: str) -> list[str]:
+    """Returns relative paths of every .py file under source_dir, skipping generated outputs."""
+    sources = []
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py") and not name.endswith(GENERATED_SUFFIXES):
+                sources.append(os.path.relpath(os.path.join(root, name), source_dir))
+    return sources
+
+
+def inject_file(task: tuple) -> dict:
+    """Injects one file. Runs inside a worker process."""
+    source_path, output_path, config = task
+    try:
+        with open(source_path, "r") as f:
+            code = f.read()
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        injector = BugInjector(config)
+        buggy_code = injector.inject_bugs(code, source_path=output_path)
+
+        buggy_path = output_path[:-len(".py")] + "_buggy.py"
+        with open(buggy_path, "w") as f:
+            f.write(buggy_code)
+
+        return {"source": source_path, "buggy": buggy_path, "bugs": len(injector.logs), "error": None}
+    except (OSError, UnicodeDecodeError) as e:
+        return {"source": source_path, "buggy": None, "bugs": 0, "error": str(e)}
+
+
+def inject_tree(source_dir: str, config: BugInjectionConfig, output_dir: str | None = None,
+                workers: int | None = None) -> list[dict]:
+    """
+    Injects bugs into every .py file under source_dir across a process pool.
+
+    Each file gets its own seed derived from config.seed and its relative path,
+    so the output does not depend on the worker count or scheduling order.
+    Outputs and .jsonl logs go next to each source, or into a mirrored output_dir;
+    render a log with `python bug_log.py <log>` when a text report is needed.
+    """
+    output_dir = output_dir or source_dir
+    tasks = []
+    for rel_path in find_sources(source_dir):
+        file_config = replace(config, seed=file_seed(config.seed, rel_path), text_report=False)
+        tasks.append((os.path.join(source_dir, rel_path), os.path.join(output_dir, rel_path), file_config))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        return [inject_file(task) for task in tasks]
+
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(inject_file, tasks, chunksize=chunksize))
@@ -0,0 +1,179 @@
+import bisect
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+LOG_FORMAT = 1
+
+
+def content_hash(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def line_edit(line_number: int, before: str, after: str) -> list:
+    """
+    Smallest [line_number, column, removed, inserted] edit turning before into after.
+    Undo by replacing len(inserted) characters at column with removed.
+    """
+    prefix = 0
+    limit = min(len(before), len(after))
+    while prefix < limit and before[prefix] == after[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and before[-1 - suffix] == after[-1 - suffix]:
+        suffix += 1
+    return [line_number, prefix, before[prefix:len(before) - suffix], after[prefix:len(after) - suffix]]
+
+
+@dataclass
+class BugLog:
+    source: str
+    sha256: str
+    line_count: int
+    bugs: list[dict] = field(default_factory=list)
+    deleted_lines: list[list] = field(default_factory=list)
+    blank_lines_after: list[int] = field(default_factory=list)
+    modified_sha256: str | None = None
+
+    def modified_line_number(self, line_number: int) -> int | None:
+        """Where an original line ended up in the modified file, or None if it was deleted."""
+        deleted = [n for n, _ in self.deleted_lines]
+        index = bisect.bisect_left(deleted, line_number)
+        if index < len(deleted) and deleted[index] == line_number:
+            return None
+        return line_number - index + bisect.bisect_left(self.blank_lines_after, line_number)
+
+
+class BugLogWriter:
+    """
+    Streams a JSONL bug log: a file record with the source hash, one bug
+    record per injected bug as it happens, and an end record describing the
+    line deletions/insertions and the hash of the modified code.
+
+    Every edit is [line_number, column, removed, inserted] in original line
+    numbering, listed in the order it was applied. Pass stream to write the
+    records to an open text stream instead of log_path; it is left open.
+    """
+
+    def __init__(self, log_path: str | None, source: str, code: str, stream=None):
+        self.log_path = log_path
+        self.owns_file = stream is None
+        self.file = open(log_path, "w") if stream is None else stream
+        self._write({
+            "record": "file",
+            "format": LOG_FORMAT,
+            "source": source,
+            "sha256": content_hash(code),
+            "line_count": len(code.split("\n")),
+        })
+
+    def _write(self, record: dict):
+        self.file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def write_bug(self, log: dict, edits: list[list]):
+        # Whole lines and rename sites are recoverable from the edits, so only the edits are kept.
+        record = {"record": "bug", **log, "edits": edits}
+        for key in ("original_line", "modified_line", "global_replace", "replaced_at"):
+            record.pop(key, None)
+        self._write(record)
+
+    def close(self, modified_code: str, deleted_lines: list[list], blank_lines_after: list[int]):
+        self._write({
+            "record": "end",
+            "deleted_lines": deleted_lines,
+            "blank_lines_after": blank_lines_after,
+            "modified_sha256": content_hash(modified_code),
+        })
+        if self.owns_file:
+            self.file.close()
+
+
+def parse_log(lines, name: str = "<stream>") -> BugLog:
+    """Builds a BugLog from JSONL records, e.g. the text written to an inject_bugs log_stream."""
+    log = None
+    for raw in lines:
+        if not raw.strip():
+            continue
+        record = json.loads(raw)
+        kind = record.pop("record")
+        if kind == "file":
+            if record["format"] != LOG_FORMAT:
+                raise ValueError(f"Unsupported bug log format {record['format']} in {name}")
+            log = BugLog(record["source"], record["sha256"], record["line_count"])
+        elif kind == "bug":
+            log.bugs.append(record)
+        elif kind == "end":
+            log.deleted_lines = record["deleted_lines"]
+            log.blank_lines_after = record["blank_lines_after"]
+            log.modified_sha256 = record["modified_sha256"]
+    if log is None:
+        raise ValueError(f"{name} is not a bug log")
+    return log
+
+
+def read_log(log_path: str) -> BugLog:
+    with open(log_path, "r") as f:
+        return parse_log(f, log_path)
+
+
+def apply_edit(line: str, edit: list) -> str:
+    _, column, removed, inserted = edit
+    return line[:column] + inserted + line[column + len(removed):]
+
+
+def render_text(log: BugLog, original_code: str | None = None) -> str:
+    """
+    Human-readable report of a bug log. With the original code (checked
+    against the logged hash) the report shows whole lines by replaying the
+    edits; otherwise it shows just the edited spans.
+    """
+    whole_lines = {}
+    if original_code is not None and content_hash(original_code) == log.sha256:
+        lines = original_code.split("\n")
+        for i, bug in enumerate(log.bugs):
+            idx = bug["line_number"] - 1
+            before = lines[idx]
+            for edit in bug["edits"]:
+                lines[edit[0] - 1] = apply_edit(lines[edit[0] - 1], edit)
+            whole_lines[i] = (before, lines[idx])
+
+    report = [
+        f"Original File: {log.source}",
+        f"Source sha256: {log.sha256}",
+        f"Bug Log ({len(log.bugs)} bugs):",
+        "",
+    ]
+    order = sorted(range(len(log.bugs)), key=lambda i: log.bugs[i].get("line_number", float("inf")))
+    for i in order:
+        bug = log.bugs[i]
+        line_no = bug.get("line_number", "unknown")
+        bug_type = bug.get("bug_type", "unknown")
+        bug_subtype = bug.get("bug_subtype", "")
+
+        if "original_word" in bug:
+            original, modified = bug["original_word"], bug["modified_word"]
+        elif i in whole_lines:
+            original, modified = whole_lines[i]
+        elif bug["edits"]:
+            _, _, original, modified = bug["edits"][0]
+        else:
+            original = modified = "N/A"
+
+        report.append(
+            f"- Line {line_no}: \"{original}\" → \"{modified}\" (type: {bug_type}, subtype: {bug_subtype})"
+        )
+    return "\n".join(report) + "\n"
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    # Logs sit next to their source as <file>_bug_log.jsonl; use the source for whole lines when it still matches.
+    for path in sys.argv[1:]:
+        source_path = path[:-len("_bug_log.jsonl")] if path.endswith("_bug_log.jsonl") else None
+        original_code = None
+        if source_path and os.path.exists(source_path):
+            with open(source_path, "r") as f:
+                original_code = f.read()
+        print(render_text(read_log(path), original_code))
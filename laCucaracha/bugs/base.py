@@ -1,3 +1,20 @@
+import random
+
 class Bug:
+    def __init__(self, rng: random.Random | None = None):
+        # Each bug draws from its injector's generator so injectors never share random state.
+        self.rng = rng or random.Random()
+
+    def eligible_subtypes(self, line: str) -> list[str]:
+        """Subtypes that are guaranteed to change this line when injected."""
+        raise NotImplementedError("Each bug must implement the eligible_subtypes method.")
+
+    def is_eligible(self, line: str) -> bool:
+        """
+        Whether eligible_subtypes(line) is non-empty. Site selection asks this
+        of every line, so subclasses answer it without building the subtypes.
+        """
+        return bool(self.eligible_subtypes(line))
+
     def inject(self, line: str) -> str:
         raise NotImplementedError("Each bug must implement the inject method.")
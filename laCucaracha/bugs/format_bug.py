@@ -1,19 +1,61 @@
-import random
 import re
 from .base import Bug
 
+SPACING_MAP = {
+    r"\s*=\s*": "=",
+    r"\s*\+\s*": "+",
+    r"\s*-\s*": "-",
+    r"\s*\*\s*": "*",
+    r"\s*/\s*": "/",
+    r"\s*==\s*": "==",
+    r"\s*,\s*": ",",
+    r"\s*:\s*": ":"
+}
+
+BLOCK_STARTERS = ("def ", "if ", "elif ", "else", "try", "with", "for ", "while ")
+
 class FormatBug(Bug):
+    def spacing_variants(self, line: str) -> list[str]:
+        """Every tightened or loosened spacing rewrite of line that actually differs from it."""
+        variants = []
+        for pattern, operator in SPACING_MAP.items():
+            if re.search(pattern, line):
+                for replacement in (operator, f" {operator} "):
+                    modified_line = re.sub(pattern, replacement, line)
+                    if modified_line != line:
+                        variants.append(modified_line)
+        return variants
+
+    def is_eligible(self, line: str) -> bool:
+        # extra_blank_line applies to every non-empty line.
+        return bool(line.strip())
+
+    def eligible_subtypes(self, line: str) -> list[str]:
+        stripped = line.strip()
+        if not stripped:
+            return []
+        subtypes = []
+        if line.startswith("    ") or line.startswith("\t"):
+            subtypes.append("indent_soft")
+        if self.spacing_variants(line):
+            subtypes.append("spacing")
+        subtypes.append("extra_blank_line")
+        if stripped.startswith(BLOCK_STARTERS):
+            subtypes.append("block_indent")
+        return subtypes
+
     def inject(self, line: str) -> tuple[str, dict | None]:
         original_line = line
         stripped = line.strip()
 
-        if not stripped:
+        subtypes = self.eligible_subtypes(line)
+        if not subtypes:
             return line, None  # skip empty lines
 
-        if random.random() >= 1.0:
+        if self.rng.random() >= 1.0:
             return line, None
 
-        bug_subtype = random.choice(["indent_soft", "spacing", "extra_blank_line", "block_indent"])
+        bug_subtype = self.rng.choice(subtypes)
         modified_line = line
 
         # indent_soft: mimics inconsistent indentation style on single line
@@ -27,24 +69,7 @@ class FormatBug(Bug):
 
         # spacing: mimics inconsistent spacing by adding or removing spaces
         elif bug_subtype == "spacing":
-            spacing_map = {
-                r"\s*=\s*": "=",
-                r"\s*\+\s*": "+",
-                r"\s*-\s*": "-",
-                r"\s*\*\s*": "*",
-                r"\s*/\s*": "/",
-                r"\s*==\s*": "==",
-                r"\s*,\s*": ",",
-                r"\s*:\s*": ":"
-            }
-
-            pattern, operator = random.choice(list(spacing_map.items()))
-
-            if re.search(pattern, line):
-                if random.random() < 0.5:
-                    modified_line = re.sub(pattern, operator, line)
-                else:
-                    modified_line = re.sub(pattern, f" {operator} ", line)
+            modified_line = self.rng.choice(self.spacing_variants(line))
 
         # extra_blank_line: mimics inserting an unnecessary blank line
         elif bug_subtype == "extra_blank_line":
@@ -58,12 +83,6 @@ class FormatBug(Bug):
 
         # block_indent: mimic increasing indentation for a full block (handled in injector)
         elif bug_subtype == "block_indent":
-            block_starters = ("def ", "if ", "elif ", "else", "try", "with", "for ", "while ")
-            safe = any(stripped.startswith(start) for start in block_starters)
-
-            if not safe:
-                return line, None
-
             modified_line = "    " + line
 
             return modified_line, {
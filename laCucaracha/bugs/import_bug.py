@@ -1,19 +1,60 @@
-import random
+import bisect
+import os
 import re
-import pkgutil
 import sys
+from functools import lru_cache
 from .base import Bug
+from utils.module_index import load_module_names
+
+# laCucaracha's own modules are not library imports to swap in.
+LACUCARACHA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@lru_cache(maxsize=1)
+def module_choices() -> tuple[str, ...]:
+    """Every importable and builtin module name, sorted once per process."""
+    return tuple(sorted(load_module_names(exclude=(LACUCARACHA_DIR,)).union(set(sys.builtin_module_names))))
+
+
+class Without:
+    """Read-only view of a sorted tuple with one name left out, without copying it."""
+
+    def __init__(self, names: tuple[str, ...], excluded: str):
+        self.names = names
+        index = bisect.bisect_left(names, excluded)
+        self.skip = index if index < len(names) and names[index] == excluded else len(names)
+
+    def __len__(self) -> int:
+        return len(self.names) - (self.skip < len(self.names))
+
+    def __getitem__(self, i: int) -> str:
+        return self.names[i + (i >= self.skip)]
+
 
 class ImportBug(Bug):
-    def inject(self, line: str) -> tuple[str, dict | None]:
+    def is_eligible(self, line: str) -> bool:
+        stripped = line.strip()
+        return stripped.startswith("import") or stripped.startswith("from")
+
+    def eligible_subtypes(self, line: str) -> list[str]:
         stripped = line.strip()
         if not (stripped.startswith("import") or stripped.startswith("from")):
+            return []
+        subtypes = ["comment", "remove"]
+        if re.match(r"^\s*import\s+(\w+)", stripped):
+            subtypes += ["swap_one", "swap_all"]
+        return subtypes
+
+    def inject(self, line: str) -> tuple[str, dict | None]:
+        stripped = line.strip()
+        subtypes = self.eligible_subtypes(line)
+        if not subtypes:
             return line, None
 
-        if random.random() >= 1.0:
+        if self.rng.random() >= 1.0:
             return line, None
 
-        bug_subtype = random.choice(["comment", "remove", "swap_one", "swap_all"])
+        bug_subtype = self.rng.choice(subtypes)
         modified_line = line
         original_line = line
 
@@ -33,13 +74,10 @@ class ImportBug(Bug):
             match = re.match(r"^\s*import\s+(\w+)", stripped)
             if match:
                 original_module = match.group(1)
-                all_modules = {
-                    name for _, name, _ in pkgutil.iter_modules()
-                }.union(set(sys.builtin_module_names))
-                alternatives = list(all_modules - {original_module})
+                alternatives = Without(module_choices(), original_module)
 
                 if alternatives:
-                    replacement_module = random.choice(alternatives)
+                    replacement_module = self.rng.choice(alternatives)
                     modified_line = line.replace(original_module, replacement_module)
                 else:
                     return line, None
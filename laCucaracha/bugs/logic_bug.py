@@ -1,19 +1,62 @@
-import random
 import re
 from .base import Bug
 
+SWAP_MAP = {
+    "==": "!=",
+    "!=": "==",
+    "<=": ">=",
+    ">=": "<=",
+    "<": ">",
+    ">": "<"
+}
+
+SWAP_PATTERNS = {op: r"(?<![<>=!])\s*" + re.escape(op) + r"\s*(?![<>=!])" for op in SWAP_MAP}
+
 class LogicBug(Bug):
-    def inject(self, line: str) -> tuple[str, dict | None]:
-        original_line = line
+    def range_inner(self, line: str) -> str | None:
+        """The range() argument an off_by_one bug can rewrite in place, if any."""
+        range_match = re.search(r"range\(\s*([^)]+?)\s*\)", line)
+        if range_match:
+            inner = range_match.group(1).strip()
+            if inner.count('(') <= 1 and inner.count(')') <= 1 and f"range({inner})" in line:
+                return inner
+        return None
+
+    def is_eligible(self, line: str) -> bool:
         stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            return False
+        if "True" in line or "False" in line:
+            return True
+        # Every comparison operator contains one of these characters.
+        if any(char in line for char in "<>=!") and any(re.search(pattern, line) for pattern in SWAP_PATTERNS.values()):
+            return True
+        return "range(" in line and self.range_inner(line) is not None
 
+    def eligible_subtypes(self, line: str) -> list[str]:
+        stripped = line.strip()
         if not stripped or stripped.startswith("#"):
+            return []
+        subtypes = []
+        if "True" in line or "False" in line:
+            subtypes.append("bool_flip")
+        if any(re.search(pattern, line) for pattern in SWAP_PATTERNS.values()):
+            subtypes.append("comparison_swap")
+        if self.range_inner(line) is not None:
+            subtypes.append("off_by_one")
+        return subtypes
+
+    def inject(self, line: str) -> tuple[str, dict | None]:
+        original_line = line
+
+        subtypes = self.eligible_subtypes(line)
+        if not subtypes:
             return line, None
 
-        if random.random() >= 1.0:
+        if self.rng.random() >= 1.0:
             return line, None
 
-        bug_subtype = random.choice(["bool_flip", "comparison_swap", "off_by_one"])
+        bug_subtype = self.rng.choice(subtypes)
         modified_line = line
 
         # Flip boolean literals True <-> False
@@ -25,37 +68,25 @@ class LogicBug(Bug):
 
         # Swap comparison operators (== -> !=, < -> >)
         elif bug_subtype == "comparison_swap":
-            swap_map = {
-                "==": "!=",
-                "!=": "==",
-                "<=": ">=",
-                ">=": "<=",
-                "<": ">",
-                ">": "<"
-            }
-
-            for op, swapped in swap_map.items():
-                pattern = r"(?<![<>=!])\s*" + re.escape(op) + r"\s*(?![<>=!])"
+            for op, swapped in SWAP_MAP.items():
+                pattern = SWAP_PATTERNS[op]
                 if re.search(pattern, line):
                     modified_line = re.sub(pattern, f" {swapped} ", line, count=1)
                     break
 
         # Off-by-one errors: +1/-1 around indexing or range()
         elif bug_subtype == "off_by_one":
-            range_match = re.search(r"range\(\s*([^)]+?)\s*\)", line)
-            if range_match:
-                inner = range_match.group(1).strip()
-                if inner.count('(') <= 1 and inner.count(')') <= 1:
-                    if re.search(r"[\+\-]\s*1", inner):
-                        if "+1" in inner.replace(" ", ""):
-                            new_inner = re.sub(r"\+\s*1", "-1", inner)
-                        else:
-                            new_inner = re.sub(r"\-\s*1", "+1", inner)
-                    else:
-                        op = random.choice([" + 1", " - 1"])
-                        new_inner = inner + op
+            inner = self.range_inner(line)
+            if re.search(r"[\+\-]\s*1", inner):
+                if "+1" in inner.replace(" ", ""):
+                    new_inner = re.sub(r"\+\s*1", "-1", inner)
+                else:
+                    new_inner = re.sub(r"\-\s*1", "+1", inner)
+            else:
+                op = self.rng.choice([" + 1", " - 1"])
+                new_inner = inner + op
 
-                    modified_line = line.replace(f"range({inner})", f"range({new_inner})")
+            modified_line = line.replace(f"range({inner})", f"range({new_inner})")
 
         if modified_line != original_line:
             return modified_line, {
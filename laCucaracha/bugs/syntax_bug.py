@@ -1,44 +1,55 @@
-import random
 import re
 from .base import Bug
 
 class SyntaxBug(Bug):
-    def inject(self, line: str) -> tuple[str, dict | None]:
+    def is_eligible(self, line: str) -> bool:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            return False
+        # extra_comma needs parentheses too, so unclosed_paren already covers it.
+        return ("(" in line and ")" in line) or bool(re.match(r"^(if|elif|else|for|while|def|class)\b.*:\s*$", stripped))
+
+    def eligible_subtypes(self, line: str) -> list[str]:
         stripped = line.strip()
         if not stripped or stripped.startswith("#"):
+            return []
+        subtypes = []
+        if re.match(r"^(if|elif|else|for|while|def|class)\b.*:\s*$", stripped):
+            subtypes.append("missing_colon")
+        if "(" in line and ")" in line:
+            subtypes.append("unclosed_paren")
+        match = re.search(r"\((.*?)\)", line)
+        if match and "," in match.group(1):
+            subtypes.append("extra_comma")
+        return subtypes
+
+    def inject(self, line: str) -> tuple[str, dict | None]:
+        subtypes = self.eligible_subtypes(line)
+        if not subtypes:
             return line, None
 
-        if random.random() >= 1.0:
+        if self.rng.random() >= 1.0:
             return line, None
 
-        bug_subtype = random.choice([
-            "missing_colon",
-            "unclosed_paren",
-            "extra_comma"
-        ])
+        bug_subtype = self.rng.choice(subtypes)
         modified_line = line
 
         # missing_colon removes colon from lines that require it
         if bug_subtype == "missing_colon":
-            if re.match(r"^(if|elif|else|for|while|def|class)\b.*:\s*$", stripped):
-                modified_line = re.sub(r":\s*$", "", line)
+            modified_line = re.sub(r":\s*$", "", line)
 
         # unclosed_paren removes a closing parenthesis
         elif bug_subtype == "unclosed_paren":
-            if "(" in line and ")" in line:
-                modified_line = line[::-1].replace(")", "", 1)[::-1]
+            modified_line = line[::-1].replace(")", "", 1)[::-1]
 
         # extra_comma adds an unnecessary comma in argument or list/tuple
         elif bug_subtype == "extra_comma":
-            match = re.search(r"\((.*?)\)", line)
-            if match:
-                contents = match.group(1)
-                parts = contents.split(",")
-                if len(parts) > 1:
-                    insert_at = random.randint(0, len(parts) - 2)
-                    parts.insert(insert_at + 1, "")
-                    modified = ",".join(parts)
-                    modified_line = line.replace(contents, modified)
+            contents = re.search(r"\((.*?)\)", line).group(1)
+            parts = contents.split(",")
+            insert_at = self.rng.randint(0, len(parts) - 2)
+            parts.insert(insert_at + 1, "")
+            modified = ",".join(parts)
+            modified_line = line.replace(contents, modified)
 
         if modified_line != line:
             return modified_line, {
@@ -1,4 +1,3 @@
-import random
 import re
 from .base import Bug
 
@@ -12,32 +11,55 @@ KEYBOARD_NEIGHBORS = {
 }
 
 class TypoBug(Bug):
+    def word_subtypes(self, word: str) -> list[str]:
+        """Subtypes that are guaranteed to change this word."""
+        if len(word) < 2 or word.startswith("#"):
+            return []
+        subtypes = []
+        if any(word[i] != word[i + 1] for i in range(len(word) - 1)):
+            subtypes.append("swap")
+        subtypes += ["omit", "duplicate"]
+        if any(ch.lower() in KEYBOARD_NEIGHBORS for ch in word):
+            subtypes += ["replace", "insert_neighbor"]
+        subtypes.append("insert_random")
+        return subtypes
+
+    def is_eligible(self, line: str) -> bool:
+        # omit applies to every word word_subtypes accepts.
+        return any(len(word) >= 2 and not word.startswith("#") for word in line.split())
+
+    def eligible_subtypes(self, line: str) -> list[str]:
+        subtypes = []
+        for word in line.split():
+            for subtype in self.word_subtypes(word):
+                if subtype not in subtypes:
+                    subtypes.append(subtype)
+        return subtypes
+
     def inject(self, line: str) -> tuple[str, dict | None]:
         words = line.split()
-        if not words:
+        candidates = [i for i, word in enumerate(words) if self.word_subtypes(word)]
+        if not candidates:
             return line, None
 
         # Adjust probability as desired (e.g., 0.9 = 10% chance)
-        if random.random() >= 1.0:
+        if self.rng.random() >= 1.0:
             return line, None
 
-        idx = random.randint(0, len(words) - 1)
+        idx = self.rng.choice(candidates)
         original_word = words[idx]
 
-        if len(original_word) < 2 or original_word.startswith("#"):
-            return line, None
-
         # Optional: avoid modifying strings or numbers
         if False:
             if re.fullmatch(r"(\".*?\"|'.*?'|\d+)", original_word):
                 return line, None
 
-        bug_subtype = random.choice(["swap", "omit", "duplicate", "replace", "insert_neighbor", "insert_random"])
+        bug_subtype = self.rng.choice(self.word_subtypes(original_word))
         modified_word = original_word
 
-        # swap: reorder two adjacent characters
-        if bug_subtype == "swap" and len(original_word) >= 2:
-            i = random.randint(0, len(original_word) - 2)
+        # swap: reorder two adjacent distinct characters
+        if bug_subtype == "swap":
+            i = self.rng.choice([j for j in range(len(original_word) - 1) if original_word[j] != original_word[j + 1]])
             modified_word = (
                 original_word[:i] +
                 original_word[i+1] +
@@ -47,34 +69,30 @@ class TypoBug(Bug):
 
         # omit: delete a character
         elif bug_subtype == "omit":
-            i = random.randint(0, len(original_word) - 1)
+            i = self.rng.randint(0, len(original_word) - 1)
             modified_word = original_word[:i] + original_word[i+1:]
 
         # duplicate: repeat a character
         elif bug_subtype == "duplicate":
-            i = random.randint(0, len(original_word) - 1)
+            i = self.rng.randint(0, len(original_word) - 1)
             modified_word = original_word[:i] + original_word[i] + original_word[i:]
 
         # replace: use a neighboring keyboard key instead of the intended
         elif bug_subtype == "replace":
-            i = random.randint(0, len(original_word) - 1)
+            i = self.rng.choice([j for j, ch in enumerate(original_word) if ch.lower() in KEYBOARD_NEIGHBORS])
             c = original_word[i].lower()
-            if c in KEYBOARD_NEIGHBORS:
-                replacement = random.choice(KEYBOARD_NEIGHBORS[c])
-                modified_word = original_word[:i] + replacement + original_word[i+1:]
+            replacement = self.rng.choice(KEYBOARD_NEIGHBORS[c])
+            modified_word = original_word[:i] + replacement + original_word[i+1:]
 
         # insert_neighbor: add a neighboring character
         elif bug_subtype == "insert_neighbor":
             valid_indices = [j for j, ch in enumerate(original_word) if ch.lower() in KEYBOARD_NEIGHBORS]
-            if not valid_indices:
-                return line, None
-
-            i = random.choice(valid_indices)
+            i = self.rng.choice(valid_indices)
             c = original_word[i].lower()
             neighbors = KEYBOARD_NEIGHBORS[c]
-            char = random.choice(neighbors)
+            char = self.rng.choice(neighbors)
 
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 modified_word = original_word[:i] + char + original_word[i:]
             else:
                 modified_word = original_word[:i+1] + char + original_word[i+1:]
@@ -82,8 +100,8 @@ class TypoBug(Bug):
 
         # insert_random: add a random character
         elif bug_subtype == "insert_random":
-            i = random.randint(0, len(original_word))
-            char = random.choice("abcdefghijklmnopqrstuvwxyz")
+            i = self.rng.randint(0, len(original_word))
+            char = self.rng.choice("abcdefghijklmnopqrstuvwxyz")
             modified_word = original_word[:i] + char + original_word[i:]
 
         if modified_word != original_word:
@@ -10,4 +10,5 @@ class BugSeverity(Enum):
 class BugInjectionConfig:
     bugs_per_lines: int
     severity: BugSeverity
-    seed: int = None
\ No newline at end of file
+    seed: int = None
+    text_report: bool = True  # also render the .jsonl bug log as a .txt report
\ No newline at end of file
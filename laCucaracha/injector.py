@@ -4,141 +4,177 @@ import re
 from typing import Optional
 from bugs import *
 from config import BugInjectionConfig
+from bug_log import BugLogWriter, line_edit, read_log, render_text
+from utils.block_index import BlockIndex
+from utils.document import Document
+from utils.identifier_index import IdentifierIndex, replace_at
 
 class BugInjector:
     def __init__(self, config: BugInjectionConfig):
         self.config = config
-        if config.seed is not None:
-            random.seed(config.seed)
+        self.rng = random.Random(config.seed)
         self.bug_classes = [
-            TypoBug(),
-            ImportBug(),
-            FormatBug(),
-            SyntaxBug(),
-            LogicBug()
+            TypoBug(self.rng),
+            ImportBug(self.rng),
+            FormatBug(self.rng),
+            SyntaxBug(self.rng),
+            LogicBug(self.rng)
         ]
         self.logs = []
 
-    def get_block_lines(self, lines, start_index):
+    def apply_global_replace(self, doc, skip_index, replacements, identifiers, blocks):
         """
-        Given lines and a start index pointing to a block header line,
-        returns list of indices of lines belonging to the block (including the header).
+        Renames identifiers only on the lines the identifier index says reference them.
+        Returns [line_number, column, old, new] for every rewrite in the order it
+        was applied, so the rename can be undone exactly.
         """
-        block_lines = [start_index]
-        header_indent = len(lines[start_index]) - len(lines[start_index].lstrip(' '))
-
-        for i in range(start_index + 1, len(lines)):
-            line = lines[i]
-
-            if not line.strip():
-                block_lines.append(i)
-                continue
-
-            line_indent = len(line) - len(line.lstrip(' '))
-
-            if line_indent > header_indent:
-                block_lines.append(i)
-            else:
-                break
-
-        return block_lines
+        sites = []
+        for old, new in replacements.items():
+            for i, columns in identifiers.lines_with(old).items():
+                if i == skip_index or doc.is_deleted(i):
+                    continue
+                if doc[i] != doc.original(i):
+                    # Another bug already rewrote this line, so the indexed columns are stale.
+                    columns = [m.start() for m in re.finditer(rf"\b{re.escape(old)}\b", doc[i])]
+                if not columns:
+                    continue
+                doc[i] = replace_at(doc[i], columns, old, new)
+                blocks.update(i, doc[i])
+                # replace_at works right to left; record the sites in that same order.
+                sites.extend([i + 1, col, old, new] for col in sorted(columns, reverse=True))
+        return sites
+
+    def build_eligibility(self, lines):
+        """
+        One pass over the file recording, for every line, the bug classes
+        that are guaranteed to change it. Only the cheap is_eligible checks run
+        here; subtypes and variants are built by inject() for chosen sites.
+        """
+        return [
+            [bug for bug in self.bug_classes if bug.is_eligible(line)]
+            for line in lines
+        ]
 
-    def inject_bugs(self, code: str, source_path: Optional[str] = None) -> str:
+    def inject_bugs(self, code: str, source_path: Optional[str] = None, log_stream=None) -> str:
+        """
+        Injects bugs into code and returns the modified code. With source_path
+        the bug log is written next to it; with log_stream the JSONL records go
+        to that stream instead and nothing is written to disk. self.logs
+        holds the bugs of the latest call only.
+        """
+        self.logs = []
         lines = code.split("\n")
         total_bugs = max(1, len(lines) // self.config.bugs_per_lines)
 
-        valid_lines = [i for i, line in enumerate(lines) if line.strip()]
+        eligibility = self.build_eligibility(lines)
+        blocks = BlockIndex(lines)
+        identifiers = None
+
+        valid_lines = [i for i, bugs in enumerate(eligibility) if bugs]
         if not valid_lines:
             return code
 
-        chosen_lines = random.sample(valid_lines, min(total_bugs, len(valid_lines)))
+        chosen_lines = self.rng.sample(valid_lines, min(total_bugs, len(valid_lines)))
+
+        # Edits address lines by their original index, so chosen indices and
+        # logged line numbers never drift as lines are removed or inserted.
+        doc = Document(lines)
 
-        empty_line_indices = set()
+        writer = None
+        if log_stream is not None:
+            writer = BugLogWriter(None, os.path.basename(source_path or "<memory>"), code, stream=log_stream)
+        elif source_path:
+            writer = BugLogWriter(self.log_path(source_path, ".jsonl"), os.path.basename(source_path), code)
+
+        deleted_lines = []
 
         for line_no in chosen_lines:
-            bug = random.choice(self.bug_classes)
-            original_line = lines[line_no]
+            original_line = doc[line_no]
+            if original_line != doc.original(line_no):
+                # An earlier block_indent or global_replace rewrote this line; reclassify just this one.
+                eligibility[line_no] = [bug for bug in self.bug_classes if bug.is_eligible(original_line)]
+            if not eligibility[line_no]:
+                continue
+            bug = self.rng.choice(eligibility[line_no])
             modified_line, diff = bug.inject(original_line)
+            if not diff:
+                continue
 
-            if diff and diff.get("bug_subtype") == "block_indent":
+            edits = []
+            if diff.get("bug_subtype") == "block_indent":
                 # Indent whole block consistently
-                block_lines = self.get_block_lines(lines, line_no)
+                block_lines = blocks.block_lines(line_no)
 
-                current_indent = len(lines[line_no]) - len(lines[line_no].lstrip(' '))
+                current_indent = len(original_line) - len(original_line.lstrip(' '))
                 new_indent = len(modified_line) - len(modified_line.lstrip(' '))
                 indent_change = new_indent - current_indent
 
                 for idx in block_lines:
-                    line = lines[idx]
+                    if doc.is_deleted(idx):
+                        continue
+                    line = doc[idx]
                     stripped = line.lstrip(' ')
                     old_indent = len(line) - len(stripped)
                     updated_indent = max(0, old_indent + indent_change)
-                    lines[idx] = " " * updated_indent + stripped
-
-                # Log only once for the main line (you can expand if you want)
-                self.logs.append({
-                    "line_number": line_no + 1,
-                    "original_line": original_line,
-                    "modified_line": modified_line,
-                    **diff
-                })
-
-            else:
-                if diff:
-                    lines[line_no] = modified_line
-                    self.logs.append({
-                        "line_number": line_no + 1,
-                        "original_line": original_line,
-                        "modified_line": modified_line,
-                        **diff
-                    })
-
-            # After modification, check for empty line and track
-            if diff:
-                if isinstance(lines[line_no], str) and lines[line_no].strip() == "":
-                    empty_line_indices.add(line_no)
-
-                if "global_replace" in diff:
-                    for old, new in diff["global_replace"].items():
-                        for i, l in enumerate(lines):
-                            if i == line_no:
-                                continue
-                            lines[i] = re.sub(rf"\b{re.escape(old)}\b", new, lines[i])
-
-                if diff.get("insert_blank_line_after"):
-                    lines.insert(line_no + 1, "")
-
-        lines = [line for idx, line in enumerate(lines) if idx not in empty_line_indices]
-
-        modified_code = "\n".join(lines)
-
-        if source_path:
-            self._save_log(source_path, code, modified_code)
+                    doc[idx] = " " * updated_indent + stripped
+                    blocks.update(idx, doc[idx])
+                    if doc[idx] != line:
+                        edits.append(line_edit(idx + 1, line, doc[idx]))
+
+            elif modified_line != original_line:
+                doc[line_no] = modified_line
+                blocks.update(line_no, modified_line)
+                edits.append(line_edit(line_no + 1, original_line, modified_line))
+
+            # Log only once for the main line; the edits cover every line the bug touched
+            self.logs.append({
+                "line_number": line_no + 1,
+                "original_line": original_line,
+                "modified_line": modified_line,
+                **diff
+            })
+
+            # A bug that leaves its line empty removes the line
+            if doc[line_no].strip() == "":
+                deleted_lines.append([line_no + 1, doc[line_no]])
+                doc.delete(line_no)
+
+            if "global_replace" in diff:
+                if identifiers is None:
+                    identifiers = IdentifierIndex(code)
+                sites = self.apply_global_replace(doc, line_no, diff["global_replace"], identifiers, blocks)
+                self.logs[-1]["replaced_at"] = sites
+                edits.extend([line_number, col, old, new] for line_number, col, old, new in sites)
+
+            if diff.get("insert_blank_line_after"):
+                doc.insert_after(line_no, "")
+
+            if writer:
+                writer.write_bug(self.logs[-1], edits)
+
+        modified_code = doc.text()
+
+        for log in self.logs:
+            log["modified_line_number"] = doc.current_line_number(log["line_number"] - 1)
+
+        if writer:
+            writer.close(
+                modified_code,
+                deleted_lines=sorted(deleted_lines),
+                blank_lines_after=sorted(index + 1 for index in doc.inserted),
+            )
+            if self.config.text_report and log_stream is None:
+                self._save_log(source_path, code)
 
         return modified_code
 
-    def _save_log(self, source_path: str, original_code: str, modified_code: str):
+    def log_path(self, source_path: str, extension: str) -> str:
         base_name = os.path.basename(source_path)
         dir_name = os.path.dirname(source_path)
-        log_path = os.path.join(dir_name, f"{base_name}_bug_log.txt")
-
-        with open(log_path, "w") as f:
-            f.write(f"Original File: {base_name}\n")
-            f.write(f"Bug Log ({len(self.logs)} bugs):\n\n")
-
-            for log in sorted(self.logs, key=lambda l: l.get("line_number", float("inf"))):
-                line_no = log.get("line_number", "unknown")
-                bug_type = log.get("bug_type", "unknown")
-                bug_subtype = log.get("bug_subtype", "")
-
-                original = log.get("original_word") or log.get("original_line") or "N/A"
-                modified = log.get("modified_word") or log.get("modified_line") or "N/A"
-
-                f.write(
-                    f"- Line {line_no}: \"{original}\" → \"{modified}\" (type: {bug_type}, subtype: {bug_subtype})\n"
-                )
+        return os.path.join(dir_name, f"{base_name}_bug_log{extension}")
 
-            f.write("\n--- Original Code ---\n")
-            f.write(original_code)
-            f.write("\n\n--- Modified Code ---\n")
-            f.write(modified_code)
+    def _save_log(self, source_path: str, original_code: str):
+        """Renders the human-readable report from the structured log."""
+        log = read_log(self.log_path(source_path, ".jsonl"))
+        with open(self.log_path(source_path, ".txt"), "w") as f:
+            f.write(render_text(log, original_code))
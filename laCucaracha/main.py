@@ -1,14 +1,14 @@
+import argparse
 import os
 from config import BugInjectionConfig, BugSeverity
 from injector import BugInjector
+from batch import inject_tree
+from undo import undo_file, undo_tree
 
-def main():
-    target_file = os.path.join("..", "testCode", "example.py")
-    
+def inject_single(target_file: str, config: BugInjectionConfig):
     with open(target_file, "r") as f:
         original_code = f.read()
 
-    config = BugInjectionConfig(bugs_per_lines=3, severity=BugSeverity.MODERATE, seed=None)
     injector = BugInjector(config)
 
     buggy_code = injector.inject_bugs(original_code, source_path=target_file)
@@ -19,7 +19,49 @@ def main():
 
     print("✅ Bug injection complete.")
     print(f"➡️ Modified: {buggy_path}")
-    print(f"📝 Log: {target_file}_bug_log.txt")
+    print(f"📝 Log: {target_file}_bug_log.txt (structured: {target_file}_bug_log.jsonl)")
+
+def inject_directory(source_dir: str, config: BugInjectionConfig, output_dir: str | None, workers: int | None):
+    results = inject_tree(source_dir, config, output_dir=output_dir, workers=workers)
+    failed = [r for r in results if r["error"]]
+    total_bugs = sum(r["bugs"] for r in results)
+
+    print(f"✅ Bug injection complete: {len(results) - len(failed)} files, {total_bugs} bugs.")
+    for r in failed:
+        print(f"⚠️ Skipped {r['source']}: {r['error']}")
+
+def undo(target: str, workers: int | None):
+    if os.path.isdir(target):
+        results = undo_tree(target, workers=workers)
+    else:
+        results = [undo_file(target if target.endswith("_bug_log.jsonl") else f"{target}_bug_log.jsonl")]
+
+    failed = [r for r in results if r["error"]]
+    print(f"↩️ Undo complete: {len(results) - len(failed)} of {len(results)} files restored.")
+    for r in failed:
+        print(f"⚠️ Could not restore {r['file']}: {r['error']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Inject random bugs into test code.")
+    parser.add_argument("target", nargs="?", default=os.path.join("..", "testCode", "example.py"),
+                        help="file to inject, or a directory to inject every .py file under it")
+    parser.add_argument("--bugs-per-lines", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=None, help="master seed; per-file seeds are derived from it")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for directory mode")
+    parser.add_argument("--output-dir", default=None, help="mirror directory-mode outputs here instead of next to sources")
+    parser.add_argument("--undo", action="store_true", help="restore the _buggy.py files of a source file, log or directory from their bug logs")
+    args = parser.parse_args()
+
+    if args.undo:
+        undo(args.target, args.workers)
+        return
+
+    config = BugInjectionConfig(bugs_per_lines=args.bugs_per_lines, severity=BugSeverity.MODERATE, seed=args.seed)
+
+    if os.path.isdir(args.target):
+        inject_directory(args.target, config, args.output_dir, args.workers)
+    else:
+        inject_single(args.target, config)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
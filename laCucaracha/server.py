@@ -0,0 +1,123 @@
+import argparse
+import io
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import BugInjectionConfig, BugSeverity
+from injector import BugInjector
+from bugs.import_bug import module_choices
+
+DEFAULT_PORT = 8765
+
+
+def warm_up():
+    """Loads the module index and runs one injection so the first request pays no import or scan costs."""
+    module_choices()
+    BugInjector(BugInjectionConfig(bugs_per_lines=1, severity=BugSeverity.MODERATE, seed=0)).inject_bugs(
+        "import os\nif x != 1:\n    print(True)\n", log_stream=io.StringIO())
+
+
+def inject_request(request: dict) -> dict:
+    """
+    Injects bugs into request["source"] and returns the buggy source with its
+    JSONL bug log (the same records main.py writes next to a file).
+
+    Every request gets its own BugInjector, so concurrent requests share only
+    the read-only warmed state and the same seed always gives the same output.
+    """
+    source = request["source"]
+    if not isinstance(source, str):
+        raise ValueError("source must be a string")
+    config = BugInjectionConfig(
+        bugs_per_lines=int(request.get("bugs_per_lines", 3)),
+        severity=BugSeverity[request.get("severity", "MODERATE")],
+        seed=request.get("seed"),
+    )
+    if config.bugs_per_lines < 1:
+        raise ValueError("bugs_per_lines must be at least 1")
+
+    log = io.StringIO()
+    injector = BugInjector(config)
+    buggy = injector.inject_bugs(source, source_path=request.get("name", "<memory>"), log_stream=log)
+    return {"buggy": buggy, "log": log.getvalue(), "bugs": len(injector.logs)}
+
+
+class InjectHandler(BaseHTTPRequestHandler):
+    """POST /inject with a JSON body; GET /health to check the server is up."""
+
+    def _reply(self, status: int, body: dict):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        else:
+            self._reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/inject":
+            self._reply(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            self._reply(200, inject_request(request))
+        except (ValueError, KeyError, TypeError) as e:
+            self._reply(400, {"error": f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, verbose: bool = False):
+    warm_up()
+    server = ThreadingHTTPServer((host, port), InjectHandler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    print(f"🪳 Injection server listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def serve_stdio(stdin=sys.stdin, stdout=sys.stdout):
+    """
+    Answers one JSON request per input line with one JSON response line, the
+    same as POST /inject. Lets another process drive the injector as a child
+    without a port or sharing its import path.
+    """
+    warm_up()
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            response = inject_request(json.loads(line))
+        except (ValueError, KeyError, TypeError) as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+        stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve bug injections from a warmed, long-lived process.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind; keep it local")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    parser.add_argument("--stdio", action="store_true", help="read JSON requests from stdin, one per line, instead of listening")
+    args = parser.parse_args()
+    if args.stdio:
+        serve_stdio()
+    else:
+        serve(args.host, args.port, args.verbose)
+
+if __name__ == "__main__":
+    main()
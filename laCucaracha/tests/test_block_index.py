@@ -0,0 +1,34 @@
+import random
+from utils.block_index import BlockIndex, indent_of
+
+
+def scan_first_at_most(lines, start, limit):
+    for i in range(start, len(lines)):
+        if lines[i].strip() and indent_of(lines[i]) <= limit:
+            return i
+    return len(lines)
+
+
+def random_line(rng):
+    if rng.random() < 0.15:
+        return " " * rng.randrange(6)
+    return " " * (4 * rng.randrange(5)) + "x = 1"
+
+
+def test_queries_match_a_linear_scan():
+    rng = random.Random(0)
+    for n in (0, 1, 2, 7, 64, 100):
+        lines = [random_line(rng) for _ in range(n)]
+        index = BlockIndex(lines)
+        for _ in range(200 if n else 1):
+            if n and rng.random() < 0.3:
+                i = rng.randrange(n)
+                lines[i] = random_line(rng)
+                index.update(i, lines[i])
+            start = rng.randrange(n + 1)
+            limit = rng.randrange(-1, 20)
+            assert index.first_at_most(start, limit) == scan_first_at_most(lines, start, limit)
+            if start < n:
+                end = scan_first_at_most(lines, start + 1, indent_of(lines[start]))
+                assert index.block_end(start) == end
+                assert index.block_lines(start) == list(range(start, end))
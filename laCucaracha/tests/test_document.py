@@ -0,0 +1,24 @@
+import random
+from utils.document import Document
+
+
+def test_line_numbers_follow_inserts_and_deletes():
+    rng = random.Random(0)
+    lines = [f"line {i}" for i in range(50)]
+    doc = Document(lines)
+    # Reference model: the current lines keyed by (original slot, order within the slot).
+    model = {(i, 0): line for i, line in enumerate(lines)}
+    for step in range(300):
+        i = rng.randrange(len(lines))
+        if rng.random() < 0.5:
+            doc.insert_after(i, f"new {step}")
+            model[(i, step + 1)] = f"new {step}"
+        else:
+            doc.delete(i)
+            model.pop((i, 0), None)
+        keys = sorted(model)
+        for index in range(len(lines)):
+            expected = keys.index((index, 0)) + 1 if (index, 0) in model else None
+            assert doc.current_line_number(index) == expected
+        assert len(doc) == len(model)
+        assert doc.text() == "\n".join(model[key] for key in keys)
@@ -0,0 +1,37 @@
+import glob
+import os
+import pytest
+from bug_log import parse_log
+from server import inject_request
+from undo import LOG_SUFFIX, undo_code, undo_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SOURCES = [os.path.join(ROOT, "testCode", "example.py")] + sorted(glob.glob(os.path.join(ROOT, "laCucaracha", "*.py")))
+
+
+def inject(source: str, seed: int, bugs_per_lines: int = 3) -> dict:
+    return inject_request({"source": source, "seed": seed, "bugs_per_lines": bugs_per_lines, "name": "source.py"})
+
+
+@pytest.mark.parametrize("path", SOURCES, ids=os.path.basename)
+def test_undo_restores_the_original(path):
+    with open(path, "r") as f:
+        source = f.read()
+    for seed in range(5):
+        for bugs_per_lines in (1, 3):
+            response = inject(source, seed, bugs_per_lines)
+            assert response["buggy"] != source
+            assert undo_code(response["buggy"], parse_log(response["log"].splitlines())) == source
+
+
+def test_undo_file_reverts_in_place(tmp_path):
+    with open(SOURCES[0], "r") as f:
+        source = f.read()
+    response = inject(source, seed=7)
+    (tmp_path / "source.py").write_text(source)
+    (tmp_path / "source_buggy.py").write_text(response["buggy"])
+    (tmp_path / f"source.py{LOG_SUFFIX}").write_text(response["log"])
+
+    result = undo_file(str(tmp_path / f"source.py{LOG_SUFFIX}"))
+    assert result["status"] == "reverted", result["error"]
+    assert (tmp_path / "source_buggy.py").read_text() == source
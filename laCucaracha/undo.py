@@ -0,0 +1,99 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from bug_log import BugLog, content_hash, read_log
+
+LOG_SUFFIX = "_bug_log.jsonl"
+
+
+def undo_code(modified_code: str, log: BugLog) -> str:
+    """
+    Reverts injected bugs using only the log: restores deleted lines, drops
+    inserted blank lines, then reverses every edit in the opposite order it was applied.
+    """
+    modified_lines = modified_code.split("\n")
+    deleted = {line_number - 1: text for line_number, text in log.deleted_lines}
+    blank_after = {line_number - 1 for line_number in log.blank_lines_after}
+
+    lines = []
+    pos = 0
+    for idx in range(log.line_count):
+        if idx in deleted:
+            lines.append(deleted[idx])
+        else:
+            lines.append(modified_lines[pos])
+            pos += 1
+        if idx in blank_after:
+            pos += 1
+
+    for bug in reversed(log.bugs):
+        for line_number, column, removed, inserted in reversed(bug["edits"]):
+            line = lines[line_number - 1]
+            lines[line_number - 1] = line[:column] + removed + line[column + len(inserted):]
+
+    return "\n".join(lines)
+
+
+def paths_for_log(log_path: str) -> tuple[str, str]:
+    """The source and _buggy.py paths a bug log was written for."""
+    source_path = log_path[:-len(LOG_SUFFIX)]
+    return source_path, source_path[:-len(".py")] + "_buggy.py"
+
+
+def undo_file(log_path: str) -> dict:
+    """
+    Restores the _buggy.py file next to log_path in place.
+
+    The buggy file's hash decides what is needed: already-original files are
+    left alone, untouched injections are reverted from the log alone, and only
+    when the buggy file was edited afterwards is the original source read
+    (and used only if it still matches the logged hash).
+    """
+    source_path, buggy_path = paths_for_log(log_path)
+    try:
+        log = read_log(log_path)
+        with open(buggy_path, "r") as f:
+            buggy_code = f.read()
+        buggy_hash = content_hash(buggy_code)
+
+        if buggy_hash == log.sha256:
+            return {"file": buggy_path, "status": "unchanged", "error": None}
+
+        if buggy_hash == log.modified_sha256:
+            restored = undo_code(buggy_code, log)
+            if content_hash(restored) != log.sha256:
+                return {"file": buggy_path, "status": "failed", "error": "replayed log does not reproduce the original"}
+            status = "reverted"
+        else:
+            with open(source_path, "r") as f:
+                restored = f.read()
+            if content_hash(restored) != log.sha256:
+                return {"file": buggy_path, "status": "failed",
+                        "error": "buggy file was edited after injection and the original source changed too"}
+            status = "copied"
+
+        with open(buggy_path, "w") as f:
+            f.write(restored)
+        return {"file": buggy_path, "status": status, "error": None}
+    except (OSError, ValueError, KeyError) as e:
+        return {"file": buggy_path, "status": "failed", "error": str(e)}
+
+
+def find_logs(target_dir: str) -> list[str]:
+    logs = []
+    for root, dirs, files in os.walk(target_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+        logs.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(LOG_SUFFIX))
+    return logs
+
+
+def undo_tree(target_dir: str, workers: int | None = None) -> list[dict]:
+    """Restores every _buggy.py file under target_dir that has a bug log, across a process pool."""
+    log_paths = find_logs(target_dir)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(log_paths) <= 1:
+        return [undo_file(path) for path in log_paths]
+
+    chunksize = max(1, len(log_paths) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(undo_file, log_paths, chunksize=chunksize))
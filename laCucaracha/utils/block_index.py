@@ -0,0 +1,62 @@
+INF = float("inf")
+
+
+def indent_of(line: str) -> int:
+    return len(line) - len(line.lstrip(' '))
+
+
+class BlockIndex:
+    """
+    Min segment tree over the indentation of every non-blank line.
+
+    A block headed by line i runs until the first later non-blank line whose
+    indent is at most line i's, so block queries are a single O(log n)
+    descent, and re-indenting a line is an O(log n) point update.
+    """
+
+    def __init__(self, lines: list[str]):
+        self.n = len(lines)
+        self.indents = [indent_of(line) for line in lines]
+        self.size = 1
+        while self.size < max(1, self.n):
+            self.size *= 2
+        self.tree = [INF] * (2 * self.size)
+        for i, line in enumerate(lines):
+            self.tree[self.size + i] = self.indents[i] if line.strip() else INF
+        for i in range(self.size - 1, 0, -1):
+            self.tree[i] = min(self.tree[2 * i], self.tree[2 * i + 1])
+
+    def update(self, index: int, line: str):
+        """Records that line index now holds line."""
+        self.indents[index] = indent_of(line)
+        i = self.size + index
+        self.tree[i] = self.indents[index] if line.strip() else INF
+        i //= 2
+        while i:
+            self.tree[i] = min(self.tree[2 * i], self.tree[2 * i + 1])
+            i //= 2
+
+    def first_at_most(self, start: int, limit: int) -> int:
+        """Smallest non-blank line index >= start with indent <= limit, or n if there is none."""
+        if start >= self.n:
+            return self.n
+        i = self.size + start
+        if self.tree[i] <= limit:
+            return start
+        while True:
+            if i == 1:
+                return self.n
+            if i % 2 == 0 and self.tree[i + 1] <= limit:
+                i += 1
+                break
+            i //= 2
+        while i < self.size:
+            i = 2 * i if self.tree[2 * i] <= limit else 2 * i + 1
+        return min(i - self.size, self.n)
+
+    def block_end(self, start: int) -> int:
+        """Index one past the last line of the block headed by start."""
+        return self.first_at_most(start + 1, self.indents[start])
+
+    def block_lines(self, start: int) -> list[int]:
+        return list(range(start, self.block_end(start)))
@@ -0,0 +1,83 @@
+# bugSprAI loads this same module (see bugSprAI/shared.py): both tools edit files through one line model.
+
+
+class Document:
+    """
+    Line-level piece table.
+
+    The original lines are kept untouched beside the current text of each
+    original line and any lines inserted after it. Lines are addressed by
+    their original index, which never shifts, and a Fenwick tree over the
+    number of live lines per original slot translates between original and
+    current line numbers in O(log n).
+    """
+
+    def __init__(self, lines: list[str]):
+        self.original_lines = list(lines)
+        self.lines = list(lines)
+        self.inserted = {}
+        self.size = len(self.lines)
+        self.tree = [0] * (self.size + 1)
+        for i in range(1, self.size + 1):
+            self.tree[i] += 1
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+
+    def _add(self, index: int, delta: int):
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, count: int) -> int:
+        """Live lines in the first count original slots, including lines inserted after them."""
+        total = 0
+        while count > 0:
+            total += self.tree[count]
+            count -= count & -count
+        return total
+
+    def __len__(self) -> int:
+        return self._prefix(self.size)
+
+    def __getitem__(self, index: int) -> str:
+        return self.lines[index]
+
+    def __setitem__(self, index: int, line: str):
+        if self.lines[index] is None:
+            raise IndexError(f"line {index + 1} was deleted")
+        self.lines[index] = line
+
+    def original(self, index: int) -> str:
+        return self.original_lines[index]
+
+    def is_deleted(self, index: int) -> bool:
+        return self.lines[index] is None
+
+    def delete(self, index: int):
+        if self.lines[index] is not None:
+            self.lines[index] = None
+            self._add(index, -1)
+
+    def insert_after(self, index: int, line: str):
+        self.inserted.setdefault(index, []).append(line)
+        self._add(index, 1)
+
+    def live_indices(self):
+        return (i for i, line in enumerate(self.lines) if line is not None)
+
+    def current_line_number(self, index: int) -> int | None:
+        """1-based line number original line index now sits at, or None if it was deleted."""
+        if self.lines[index] is None:
+            return None
+        return self._prefix(index) + 1
+
+    def text(self, separator: str = "\n") -> str:
+        out = []
+        for i, line in enumerate(self.lines):
+            if line is not None:
+                out.append(line)
+            if i in self.inserted:
+                out.extend(self.inserted[i])
+        return separator.join(out)
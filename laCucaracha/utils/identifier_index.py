@@ -0,0 +1,38 @@
+import io
+import re
+import tokenize
+
+
+class IdentifierIndex:
+    """
+    Maps every identifier in a file to the (line index, column) pairs where it
+    occurs as a NAME token, so strings and comments are never matched.
+    Falls back to a plain word scan when the file does not tokenize.
+    """
+
+    def __init__(self, code: str):
+        self.occurrences = {}
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(code).readline):
+                if token.type == tokenize.NAME:
+                    row, col = token.start
+                    self.occurrences.setdefault(token.string, []).append((row - 1, col))
+        except (tokenize.TokenError, IndentationError, SyntaxError):
+            self.occurrences = {}
+            for row, line in enumerate(code.split("\n")):
+                for match in re.finditer(r"\b\w+\b", line):
+                    self.occurrences.setdefault(match.group(), []).append((row, match.start()))
+
+    def lines_with(self, name: str) -> dict[int, list[int]]:
+        """Line index -> columns where name occurs, in file order."""
+        lines = {}
+        for row, col in self.occurrences.get(name, []):
+            lines.setdefault(row, []).append(col)
+        return lines
+
+
+def replace_at(line: str, columns: list[int], old: str, new: str) -> str:
+    """Replaces old with new at each given column, right to left so earlier columns stay valid."""
+    for col in sorted(columns, reverse=True):
+        line = line[:col] + new + line[col + len(old):]
+    return line
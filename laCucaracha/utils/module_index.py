@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+import pkgutil
+import sys
+
+# bugSprAI loads this same module (see bugSprAI/shared.py), so both tools share one cache directory and format.
+CACHE_DIR = os.environ.get("BUGHUNT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "bughunt"))
+
+_loaded = {}
+
+
+def scanned_paths(exclude=()) -> list[str]:
+    """The sys.path entries to scan, as absolute paths, without the directories in exclude."""
+    excluded = {os.path.realpath(directory) for directory in exclude}
+    return [path for path in map(os.path.abspath, sys.path) if os.path.realpath(path) not in excluded]
+
+
+def environment_key(paths: list[str]) -> str:
+    """Fingerprint of the interpreter and every scanned path's mtime."""
+    entries = []
+    for path in paths:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        entries.append([path, mtime])
+    payload = json.dumps([sys.version, sys.executable, entries])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def cache_path(paths: list[str]) -> str:
+    """One cache file per interpreter and set of scanned paths; mtimes are checked inside it."""
+    layout = json.dumps([sys.version, sys.executable, paths])
+    return os.path.join(CACHE_DIR, f"module_index_{hashlib.sha1(layout.encode('utf-8')).hexdigest()[:16]}.json")
+
+
+def load_module_names(exclude=(), refresh: bool = False) -> set[str]:
+    """
+    Returns the names pkgutil.iter_modules() reports for sys.path, reusing
+    the on-disk snapshot while the environment key is unchanged. A tool
+    passes its own directory in exclude, so its modules (server, benchmark
+    and so on) are not taken for importable library names.
+    """
+    paths = scanned_paths(exclude)
+    key = environment_key(paths)
+    if not refresh and key in _loaded:
+        return _loaded[key]
+
+    path = cache_path(paths)
+    names = None
+    if not refresh:
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("key") == key:
+                names = set(data["modules"])
+        except (OSError, ValueError, KeyError):
+            names = None
+
+    if names is None:
+        names = set(name for _, name, _ in pkgutil.iter_modules(paths))
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"key": key, "modules": sorted(names)}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    _loaded.clear()
+    _loaded[key] = names
+    return names